@@ -1,11 +1,18 @@
 # lox/lox.py
+import platform
 import sys
 from pathlib import Path
-from rich import print
+
+# Rich pretty prints error reports and the --show/--ast output. Nothing in
+# the evaluation loop uses it, so PyPy runs skip the import and its startup
+# cost and fall back to the builtin print.
+if platform.python_implementation() != "PyPy":
+    from rich import print
 
 from lox.scanner import tokenize
 from lox.parser import parse
-from lox.interpreter import exec, Env
+from lox.interpreter import Env
+from lox.compile import compile_stmt
 from lox.errors import LoxRuntimeError, LoxStaticError, LoxSyntaxError
 from lox.ast import *
 from lox.resolver import resolve
@@ -20,8 +27,8 @@ class Lox:
         try:
             tokens = tokenize(source)
             ast = parse(tokens)
-            ast = resolve(ast)
-            exec(ast, self.environment)
+            ast = resolve(ast, self.environment)
+            compile_stmt(ast)(self.environment)
         except LoxRuntimeError as error:
             self.report_error(error, code=70)
         except (LoxSyntaxError, LoxStaticError) as error:
@@ -47,7 +54,7 @@ def main():
         if show:
             print(path.read_text())
         if ast:
-            print(resolve(parse(tokenize(path.read_text()))))
+            print(resolve(parse(tokenize(path.read_text())), Env.globals()))
         run_file(path)
     else:
         run_prompt()
@@ -1,5 +1,4 @@
-from dataclasses import dataclass
-from turtle import distance
+from dataclasses import dataclass, field
 from typing import Any
 
 from lox.tokens import Token
@@ -8,131 +7,147 @@ from lox.tokens import Token
 class Expr:
     """Abstract Base Class for expressions"""
 
+    __slots__ = ()
 
-@dataclass
+
+@dataclass(slots=True)
 class Binary(Expr):
     left: Expr
     operator: Token
     right: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Grouping(Expr):
     expression: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expr):
     value: Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Unary(Expr):
     operator: Token
     right: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Variable(Expr):
     name: Token
     depth: int = -1
+    slot: int | None = None
+    cell: list | None = field(default=None, repr=False, compare=False)
 
 
 # lox/ast.py
-@dataclass
+@dataclass(slots=True)
 class Assign(Expr):
     name: Token
     value: Expr
     depth: int = -1
+    slot: int | None = None
+    cell: list | None = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Logical(Expr):
     left: Expr
     operator: Token
     right: Expr
 
-@dataclass
+@dataclass(slots=True)
 class Call(Expr):
     callee: Expr
     paren: Token
     arguments: list[Expr]
 
-@dataclass
+@dataclass(slots=True)
 class Get(Expr):
     object: Expr
     name: Token
 
-@dataclass
+@dataclass(slots=True)
 class Set(Expr):
     object: Expr
     name: Token
     value: Expr
 
-@dataclass
+@dataclass(slots=True)
 class This(Expr):
     keyword: Token
     depth: int = -1
+    slot: int | None = None
 
-@dataclass
+@dataclass(slots=True)
 class Super(Expr):
     keyword: Token
     method: Token
     depth: int = -1
+    slot: int | None = None
 
 class Stmt:
     """Abstract Base Class for statements"""
 
+    __slots__ = ()
+
 
-@dataclass
+@dataclass(slots=True)
 class Program(Stmt):
     statements: list[Stmt]
 
 
-@dataclass
+@dataclass(slots=True)
 class Expression(Stmt):
     expression: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Print(Stmt):
     expression: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Var(Stmt):
     name: Token
     initializer: Expr
+    slot: int | None = None
+    cell: list | None = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class Block(Stmt):
     statements: list[Stmt]
 
-@dataclass
+@dataclass(slots=True)
 class If(Stmt):
     condition: Expr
     then_branch: Stmt
     else_branch: Stmt | None
 
-@dataclass
+@dataclass(slots=True)
 class While(Stmt):
     condition: Expr
     body: Stmt
 
-@dataclass
+@dataclass(slots=True)
 class Function(Stmt):
     name: Token
     params: list[Token]
     body: list[Stmt]
+    slot: int | None = None
+    cell: list | None = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class Return(Stmt):
     keyword: Token
     value: Expr | None
 
-@dataclass
+@dataclass(slots=True)
 class Class(Stmt):
     name: Token
     superclass: Variable | None
     methods: list[Function]
+    slot: int | None = None
+    cell: list | None = field(default=None, repr=False, compare=False)
 
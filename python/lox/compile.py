@@ -0,0 +1,806 @@
+"""
+Compile the AST into a tree of closures.
+
+Each node is visited only once and turned into a Python function that receives
+the environment and evaluates the node by calling the closures compiled for its
+children. Dispatching on the node type and on the operator happens at compile
+time, so executing the program is just a chain of direct calls.
+"""
+
+from collections.abc import Callable
+
+from lox.ast import *
+from lox.errors import LoxRuntimeError
+from lox.interpreter import (
+    UNDEFINED,
+    Env,
+    Value,
+    divide,
+    is_equal,
+    is_truthy,
+    stringify,
+)
+from lox.runtime import LoxCallable, LoxClass, LoxFunction, LoxInstance, LoxReturn
+from lox.tokens import Token, TokenType
+
+type Thunk = Callable[[Env], Value]
+type Action = Callable[[Env], LoxReturn | None]
+
+
+def compile_expr(expr: Expr) -> Thunk:
+    try:
+        compiler = EXPR_COMPILERS[type(expr)]
+    except KeyError:
+        msg = f"cannot compile {expr.__class__.__name__} objects"
+        raise TypeError(msg) from None
+    return compiler(expr)
+
+
+def compile_literal(expr: Literal) -> Thunk:
+    value = expr.value
+    return lambda env: value
+
+
+def compile_grouping(expr: Grouping) -> Thunk:
+    return compile_expr(expr.expression)
+
+
+def compile_unary(expr: Unary) -> Thunk:
+    operator = expr.operator
+    right = compile_expr(expr.right)
+    thunk = UNARY_OPERATORS[operator.type](right, operator)
+    if is_number_literal(expr.right):
+        return fold_constant(thunk)
+    return thunk
+
+
+def compile_binary(expr: Binary) -> Thunk:
+    operator = expr.operator
+    left = compile_expr(expr.left)
+    right = compile_expr(expr.right)
+    thunk = BINARY_OPERATORS[operator.type](left, right, operator)
+    if is_number_literal(expr.left) and is_number_literal(expr.right):
+        return fold_constant(thunk)
+    return thunk
+
+
+def compile_variable(expr: Variable) -> Thunk:
+    name = expr.name
+    lexeme = name.lexeme
+    cell = expr.cell
+
+    if expr.slot is not None:
+        return compile_slot_read(expr.depth, expr.slot)
+
+    def global_variable(env: Env) -> Value:
+        if (value := cell[0]) is UNDEFINED:
+            raise LoxRuntimeError(f"Undefined variable '{lexeme}'.", name)
+        return value
+
+    return global_variable
+
+
+def compile_assign(expr: Assign) -> Thunk:
+    name = expr.name
+    lexeme = name.lexeme
+    cell = expr.cell
+    value = compile_expr(expr.value)
+
+    if expr.slot is not None:
+        return compile_slot_write(expr.depth, expr.slot, value)
+
+    def assign_global(env: Env) -> Value:
+        result = value(env)
+        if cell[0] is UNDEFINED:
+            raise LoxRuntimeError(f"Undefined variable '{lexeme}'.", name)
+        cell[0] = result
+        return result
+
+    return assign_global
+
+
+def compile_logical(expr: Logical) -> Thunk:
+    left = compile_expr(expr.left)
+    right = compile_expr(expr.right)
+
+    if expr.operator.type == TokenType.OR:
+
+        def logic_or(env: Env) -> Value:
+            value = left(env)
+            if value is None or value is False:
+                return right(env)
+            return value
+
+        return logic_or
+
+    def logic_and(env: Env) -> Value:
+        value = left(env)
+        if value is None or value is False:
+            return value
+        return right(env)
+
+    return logic_and
+
+
+def compile_call(expr: Call) -> Thunk:
+    paren = expr.paren
+    callee = compile_expr(expr.callee)
+    arguments = tuple(map(compile_expr, expr.arguments))
+    argc = len(arguments)
+
+    def call_error(function: Value) -> LoxRuntimeError:
+        if not isinstance(function, LoxCallable):
+            msg = "Can only call functions and classes."
+        else:
+            msg = f"Expected {function.arity} arguments but got {argc}."
+        return LoxRuntimeError(msg, paren)
+
+    # The number of arguments is fixed at the call site: specialize the
+    # common small cases so they pass a tuple built without a loop.
+    if argc == 0:
+
+        def call0(env: Env) -> Value:
+            function = callee(env)
+            if not isinstance(function, LoxCallable) or function.arity != 0:
+                raise call_error(function)
+            return function.call(env, ())
+
+        return call0
+
+    if argc == 1:
+        (argument,) = arguments
+
+        def call1(env: Env) -> Value:
+            function = callee(env)
+            values = (argument(env),)
+            if not isinstance(function, LoxCallable) or function.arity != 1:
+                raise call_error(function)
+            return function.call(env, values)
+
+        return call1
+
+    def call(env: Env) -> Value:
+        function = callee(env)
+        values = tuple([arg(env) for arg in arguments])
+        if not isinstance(function, LoxCallable) or function.arity != argc:
+            raise call_error(function)
+        return function.call(env, values)
+
+    return call
+
+
+def compile_get(expr: Get) -> Thunk:
+    name = expr.name
+    lexeme = name.lexeme
+    object = compile_expr(expr.object)
+
+    # Inline cache: the last shape seen at this site, with the slot of the
+    # field or, if the property is a method, the method itself.
+    cached_shape = None
+    cached_slot = None
+    cached_method = None
+
+    def get(env: Env) -> Value:
+        nonlocal cached_shape, cached_slot, cached_method
+        obj = object(env)
+        if not isinstance(obj, LoxInstance):
+            raise LoxRuntimeError("Only instances have properties.", name)
+
+        if obj.shape is not cached_shape:
+            slot = obj.shape.fields.get(lexeme)
+            method = None
+            if slot is None:
+                method = obj.klass.find_method(lexeme)
+                if method is None:
+                    msg = f"Undefined property '{lexeme}'."
+                    raise LoxRuntimeError(msg, name)
+            cached_shape, cached_slot, cached_method = obj.shape, slot, method
+
+        if cached_slot is not None:
+            return obj.slots[cached_slot]
+        return cached_method.bind(obj)
+
+    return get
+
+
+def compile_set(expr: Set) -> Thunk:
+    name = expr.name
+    lexeme = name.lexeme
+    object = compile_expr(expr.object)
+    value = compile_expr(expr.value)
+
+    # Inline cache: the last shape seen at this site and the slot of the
+    # field. When the field is new, also the shape the instance moves to.
+    cached_shape = None
+    cached_slot = 0
+    cached_transition = None
+
+    def set(env: Env) -> Value:
+        nonlocal cached_shape, cached_slot, cached_transition
+        obj = object(env)
+        if not isinstance(obj, LoxInstance):
+            raise LoxRuntimeError("Only instances have fields.", name)
+        result = value(env)
+
+        if obj.shape is not cached_shape:
+            slot = obj.shape.fields.get(lexeme)
+            if slot is None:
+                cached_transition = obj.shape.add(lexeme)
+            else:
+                cached_slot, cached_transition = slot, None
+            cached_shape = obj.shape
+
+        if cached_transition is None:
+            obj.slots[cached_slot] = result
+        else:
+            obj.shape = cached_transition
+            obj.slots.append(result)
+        return result
+
+    return set
+
+
+def compile_this(expr: This) -> Thunk:
+    return compile_slot_read(expr.depth, expr.slot)
+
+
+def compile_super(expr: Super) -> Thunk:
+    method = expr.method
+    depth = expr.depth
+    slot = expr.slot
+
+    def super(env: Env) -> Value:
+        superclass = env.get_slot(depth, slot)
+        instance = env.get_slot(depth - 1, 0)
+        function = superclass.find_method(method.lexeme)
+        if function is None:
+            msg = f"Undefined property '{method.lexeme}'."
+            raise LoxRuntimeError(msg, method)
+        return function.bind(instance)
+
+    return super
+
+
+#
+# Statements
+#
+def compile_stmt(stmt: Stmt) -> Action:
+    try:
+        compiler = STMT_COMPILERS[type(stmt)]
+    except KeyError:
+        msg = f"cannot compile {stmt.__class__.__name__} objects"
+        raise TypeError(msg) from None
+    return compiler(stmt)
+
+
+def compile_program(stmt: Program) -> Action:
+    return compile_body(stmt.statements)
+
+
+def compile_expression_stmt(stmt: Expression) -> Action:
+    expression = compile_expr(stmt.expression)
+
+    def expression_stmt(env: Env) -> None:
+        expression(env)
+
+    return expression_stmt
+
+
+def compile_print(stmt: Print) -> Action:
+    expression = compile_expr(stmt.expression)
+
+    def print_stmt(env: Env) -> None:
+        print(stringify(expression(env)))
+
+    return print_stmt
+
+
+def compile_var(stmt: Var) -> Action:
+    slot = stmt.slot
+    initializer = compile_expr(stmt.initializer)
+
+    if slot is not None:
+
+        def local_var(env: Env) -> None:
+            env.slots[slot] = initializer(env)
+
+        return local_var
+
+    cell = stmt.cell
+
+    def global_var(env: Env) -> None:
+        cell[0] = initializer(env)
+
+    return global_var
+
+
+def compile_block(stmt: Block) -> Action:
+    body = compile_body(stmt.statements)
+    size = count_locals(stmt.statements)
+
+    if declares_closure(stmt.statements):
+
+        def block(env: Env) -> LoxReturn | None:
+            return body(env.push_frame([None] * size))
+
+        return block
+
+    # Nothing can capture the frame, so it is recycled once the block exits.
+    # Frames are kept in a free list since recursion can re-enter the block
+    # while it is still running.
+    free: list[Env] = []
+
+    def pooled_block(env: Env) -> LoxReturn | None:
+        if free:
+            frame = free.pop()
+            frame.enclosing = env
+        else:
+            frame = env.push_frame([None] * size)
+        result = body(frame)
+        free.append(frame)
+        return result
+
+    return pooled_block
+
+
+def compile_if(stmt: If) -> Action:
+    condition = compile_condition(stmt.condition)
+    then_branch = compile_stmt(stmt.then_branch)
+
+    if stmt.else_branch is None:
+
+        def if_stmt(env: Env) -> LoxReturn | None:
+            if condition(env):
+                return then_branch(env)
+
+        return if_stmt
+
+    else_branch = compile_stmt(stmt.else_branch)
+
+    def if_else_stmt(env: Env) -> LoxReturn | None:
+        if condition(env):
+            return then_branch(env)
+        return else_branch(env)
+
+    return if_else_stmt
+
+
+def compile_while(stmt: While) -> Action:
+    condition = compile_condition(stmt.condition)
+    body = compile_stmt(stmt.body)
+
+    def while_stmt(env: Env) -> LoxReturn | None:
+        while condition(env):
+            if (result := body(env)) is not None:
+                return result
+
+    return while_stmt
+
+
+def compile_function(stmt: Function) -> Action:
+    slot = stmt.slot
+    body = compile_body(stmt.body)
+    locals = count_locals(stmt.body)
+    pool = frame_pool(stmt.body)
+
+    if slot is not None:
+
+        def local_function(env: Env) -> None:
+            env.slots[slot] = LoxFunction(stmt, env, body, locals=locals, pool=pool)
+
+        return local_function
+
+    cell = stmt.cell
+
+    def global_function(env: Env) -> None:
+        cell[0] = LoxFunction(stmt, env, body, locals=locals, pool=pool)
+
+    return global_function
+
+
+def compile_return(stmt: Return) -> Action:
+    if stmt.value is None:
+        nil = LoxReturn(None)
+        return lambda env: nil
+
+    value = compile_expr(stmt.value)
+
+    # The calling function reads the value as soon as the marker reaches it,
+    # before any other Lox code runs, so each return statement can reuse a
+    # single marker instead of allocating one per call.
+    marker = LoxReturn(None)
+
+    def return_stmt(env: Env) -> LoxReturn:
+        marker.value = value(env)
+        return marker
+
+    return return_stmt
+
+
+def compile_class(stmt: Class) -> Action:
+    lexeme = stmt.name.lexeme
+    slot = stmt.slot
+    cell = stmt.cell
+    superclass_expr = stmt.superclass
+    superclass_thunk = None
+    if superclass_expr is not None:
+        superclass_thunk = compile_expr(superclass_expr)
+    methods = [
+        (
+            method,
+            compile_body(method.body),
+            count_locals(method.body),
+            method.name.lexeme == "init",
+            frame_pool(method.body),
+        )
+        for method in stmt.methods
+    ]
+
+    def class_stmt(env: Env) -> None:
+        superclass = None
+        if superclass_thunk is not None:
+            superclass = superclass_thunk(env)
+            if not isinstance(superclass, LoxClass):
+                msg = "Superclass must be a class."
+                raise LoxRuntimeError(msg, superclass_expr.name)
+
+        outer_env = env
+        if superclass is not None:
+            env = env.push_frame([superclass])
+
+        functions = {}
+        for method, body, locals, is_initializer, pool in methods:
+            function = LoxFunction(method, env, body, is_initializer, locals, pool)
+            functions[method.name.lexeme] = function
+        klass = LoxClass(lexeme, superclass, functions)
+
+        if slot is not None:
+            outer_env.slots[slot] = klass
+        else:
+            cell[0] = klass
+
+    return class_stmt
+
+
+# Compilers for each node type, looked up by the exact type of the node.
+EXPR_COMPILERS: dict[type[Expr], Callable[..., Thunk]] = {
+    Literal: compile_literal,
+    Grouping: compile_grouping,
+    Unary: compile_unary,
+    Binary: compile_binary,
+    Variable: compile_variable,
+    Assign: compile_assign,
+    Logical: compile_logical,
+    Call: compile_call,
+    Get: compile_get,
+    Set: compile_set,
+    This: compile_this,
+    Super: compile_super,
+}
+
+STMT_COMPILERS: dict[type[Stmt], Callable[..., Action]] = {
+    Program: compile_program,
+    Expression: compile_expression_stmt,
+    Print: compile_print,
+    Var: compile_var,
+    Block: compile_block,
+    If: compile_if,
+    While: compile_while,
+    Function: compile_function,
+    Return: compile_return,
+    Class: compile_class,
+}
+
+
+def compile_body(statements: list[Stmt]) -> Action:
+    """
+    Compile a sequence of statements into a single action that runs them in
+    order.
+    """
+    actions = tuple(map(compile_stmt, statements))
+
+    # Short bodies are very common in loops and small functions: run them
+    # without iterating over the action tuple.
+    if not actions:
+        return lambda env: None
+    if len(actions) == 1:
+        return actions[0]
+    if len(actions) == 2:
+        first, second = actions
+
+        def pair(env: Env) -> LoxReturn | None:
+            if (result := first(env)) is not None:
+                return result
+            return second(env)
+
+        return pair
+
+    def body(env: Env) -> LoxReturn | None:
+        for action in actions:
+            if (result := action(env)) is not None:
+                return result
+
+    return body
+
+
+def is_number_literal(expr: Expr) -> bool:
+    return isinstance(expr, Literal) and isinstance(expr.value, float)
+
+
+def fold_constant(thunk: Thunk) -> Thunk:
+    """
+    Evaluate a thunk that only depends on literals at compile time.
+
+    Errors are not folded: they must still be raised when the program reaches
+    the expression.
+    """
+    try:
+        value = thunk(None)
+    except LoxRuntimeError:
+        return thunk
+    return lambda env: value
+
+
+def compile_condition(expr: Expr) -> Callable[[Env], bool]:
+    """
+    Compile an expression used as a condition into a thunk that returns its
+    Lox truthiness as a Python bool.
+
+    Comparisons and negations already produce booleans and are used as is.
+    """
+    thunk = compile_expr(expr)
+    if isinstance(expr, Binary) and expr.operator.type in BOOLEAN_OPERATORS:
+        return thunk
+    if isinstance(expr, Unary) and expr.operator.type == TokenType.BANG:
+        return thunk
+    if isinstance(expr, Literal):
+        truth = is_truthy(expr.value)
+        return lambda env: truth
+
+    def condition(env: Env) -> bool:
+        value = thunk(env)
+        return value is not None and value is not False
+
+    return condition
+
+
+def compile_slot_read(depth: int, slot: int) -> Thunk:
+    """
+    Read a local variable stored in the given slot of an enclosing frame.
+    """
+    match depth:
+        case 0:
+            return lambda env: env.slots[slot]
+        case 1:
+            return lambda env: env.enclosing.slots[slot]
+        case 2:
+            return lambda env: env.enclosing.enclosing.slots[slot]
+        case 3:
+            return lambda env: env.enclosing.enclosing.enclosing.slots[slot]
+        case _:
+            return lambda env: env.get_slot(depth, slot)
+
+
+def compile_slot_write(depth: int, slot: int, value: Thunk) -> Thunk:
+    """
+    Assign the result of a thunk to the given slot of an enclosing frame.
+    """
+    match depth:
+        case 0:
+
+            def assign_local(env: Env) -> Value:
+                env.slots[slot] = result = value(env)
+                return result
+
+            return assign_local
+        case 1:
+
+            def assign_enclosing(env: Env) -> Value:
+                env.enclosing.slots[slot] = result = value(env)
+                return result
+
+            return assign_enclosing
+        case 2:
+
+            def assign_enclosing_2(env: Env) -> Value:
+                env.enclosing.enclosing.slots[slot] = result = value(env)
+                return result
+
+            return assign_enclosing_2
+        case _:
+
+            def assign_slot(env: Env) -> Value:
+                result = value(env)
+                env.set_slot(depth, slot, result)
+                return result
+
+            return assign_slot
+
+
+def count_locals(statements: list[Stmt]) -> int:
+    """
+    Number of slots a block or function body needs for its own declarations.
+    """
+    return sum(isinstance(stmt, (Var, Function, Class)) for stmt in statements)
+
+
+def frame_pool(body: list[Stmt]) -> list[Env] | None:
+    """
+    Free list for the call frames of a function, or None if the frames may be
+    captured by a closure and cannot be reused.
+    """
+    return None if declares_closure(body) else []
+
+
+def declares_closure(statements: list[Stmt]) -> bool:
+    """
+    Check if any function or class is declared in the statements or in the
+    blocks nested in them, which could keep a reference to the frame.
+    """
+    for stmt in statements:
+        match stmt:
+            case Function() | Class():
+                return True
+            case Block(body):
+                if declares_closure(body):
+                    return True
+            case If(_, then_branch, else_branch):
+                if declares_closure([then_branch, else_branch]):
+                    return True
+            case While(_, body):
+                if declares_closure([body]):
+                    return True
+    return False
+
+
+#
+# Operators
+#
+# Each entry receives the compiled operands and the operator token and returns
+# a thunk that evaluates the operation with the type checks inlined.
+#
+def _negate(right: Thunk, operator: Token) -> Thunk:
+    def negate(env: Env) -> Value:
+        value = right(env)
+        if isinstance(value, float):
+            return -value
+        raise LoxRuntimeError("Operand must be a number.", operator)
+
+    return negate
+
+
+def _not(right: Thunk, operator: Token) -> Thunk:
+    def not_(env: Env) -> Value:
+        value = right(env)
+        return value is None or value is False
+
+    return not_
+
+
+def _minus(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    def minus(env: Env) -> Value:
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a - b
+        raise LoxRuntimeError("Operands must be numbers.", operator)
+
+    return minus
+
+
+def _slash(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    def slash(env: Env) -> Value:
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a / b if b else divide(a, b)
+        raise LoxRuntimeError("Operands must be numbers.", operator)
+
+    return slash
+
+
+def _star(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    def star(env: Env) -> Value:
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a * b
+        raise LoxRuntimeError("Operands must be numbers.", operator)
+
+    return star
+
+
+def _plus(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    def plus(env: Env) -> Value:
+        a = left(env)
+        b = right(env)
+        kind = type(a)
+        if kind is type(b) and (kind is float or kind is str):
+            return a + b
+        msg = "Operands must be two numbers or two strings."
+        raise LoxRuntimeError(msg, operator)
+
+    return plus
+
+
+def _greater(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    def greater(env: Env) -> Value:
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a > b
+        raise LoxRuntimeError("Operands must be numbers.", operator)
+
+    return greater
+
+
+def _greater_equal(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    def greater_equal(env: Env) -> Value:
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a >= b
+        raise LoxRuntimeError("Operands must be numbers.", operator)
+
+    return greater_equal
+
+
+def _less(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    def less(env: Env) -> Value:
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a < b
+        raise LoxRuntimeError("Operands must be numbers.", operator)
+
+    return less
+
+
+def _less_equal(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    def less_equal(env: Env) -> Value:
+        a = left(env)
+        b = right(env)
+        if isinstance(a, float) and isinstance(b, float):
+            return a <= b
+        raise LoxRuntimeError("Operands must be numbers.", operator)
+
+    return less_equal
+
+
+def _bang_equal(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    return lambda env: not is_equal(left(env), right(env))
+
+
+def _equal_equal(left: Thunk, right: Thunk, operator: Token) -> Thunk:
+    return lambda env: is_equal(left(env), right(env))
+
+
+# Binary operators that always evaluate to a boolean.
+BOOLEAN_OPERATORS = frozenset(
+    {
+        TokenType.GREATER,
+        TokenType.GREATER_EQUAL,
+        TokenType.LESS,
+        TokenType.LESS_EQUAL,
+        TokenType.BANG_EQUAL,
+        TokenType.EQUAL_EQUAL,
+    }
+)
+
+UNARY_OPERATORS: dict[TokenType, Callable[[Thunk, Token], Thunk]] = {
+    TokenType.MINUS: _negate,
+    TokenType.BANG: _not,
+}
+
+BINARY_OPERATORS: dict[TokenType, Callable[[Thunk, Thunk, Token], Thunk]] = {
+    TokenType.MINUS: _minus,
+    TokenType.SLASH: _slash,
+    TokenType.STAR: _star,
+    TokenType.PLUS: _plus,
+    TokenType.GREATER: _greater,
+    TokenType.GREATER_EQUAL: _greater_equal,
+    TokenType.LESS: _less,
+    TokenType.LESS_EQUAL: _less_equal,
+    TokenType.BANG_EQUAL: _bang_equal,
+    TokenType.EQUAL_EQUAL: _equal_equal,
+}
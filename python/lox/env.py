@@ -1,52 +1,34 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from math import dist
-import time
-from lox.runtime import NativeFunction
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-@dataclass
-class Env[T]:
-    values: dict[str, T] = field(default_factory=dict)
-    enclosing: Env | None = None
-
-    @classmethod
-    def globals(cls) -> "Env":
-        return cls({"clock": NativeFunction(time.time, arity=0)})
+if TYPE_CHECKING:
+    from lox import interpreter
 
-    def __setitem__(self, name: str, value: T) -> None:
-        self.values[name] = value
-
-    def __getitem__(self, name: str) -> T:
-        if name in self.values:
-            return self.values[name]
-        if self.enclosing is not None:
-            return self.enclosing[name]
-        raise NameError(name)
+@dataclass(slots=True)
+class Env[T]:
+    """
+    Frame of a function call or block. Locals are stored by slot index and
+    the chain of frames ends at the global environment.
+    """
 
-    def assign(self, name: str, value: T):
-        if name in self.values:
-            self.values[name] = value
-        elif self.enclosing is not None:
-            self.enclosing.assign(name, value)  
-        else:
-            raise NameError(name)
+    enclosing: Env | interpreter.Env
+    slots: list[T]
 
-    def push(self) -> Env:
-        return Env(enclosing=self)
+    def push_frame(self, slots: list[T]) -> Env:
+        """
+        Create a local scope whose variables are stored by slot index.
+        """
+        return Env(enclosing=self, slots=slots)
     
-    def get_at(self, depth: int, name: str) -> T: 
+    def get_slot(self, depth: int, slot: int) -> T:
         while depth > 0:
             self = self.enclosing
             depth -= 1
-        if name in self.values:
-            return self.values[name]
-        raise NameError(name)
+        return self.slots[slot]
 
-    def assign_at(self, depth: int, name: str, value: T) -> None:
+    def set_slot(self, depth: int, slot: int, value: T) -> None:
         while depth > 0:
             self = self.enclosing
             depth -= 1
-        
-        if name not in self.values:
-            raise NameError(name)
-        self.values[name] = value
+        self.slots[slot] = value
@@ -1,10 +1,10 @@
 from __future__ import annotations
-from lox.tokens import Token
+from lox.tokens import Token, TokenType
 
 class LoxSyntaxError(Exception):
     @classmethod
     def from_token(cls, token: Token, message: str) -> LoxSyntaxError:
-        where =  "at end" if token.type == "EOF" else f"at '{token.lexeme}'"
+        where =  "at end" if token.type == TokenType.EOF else f"at '{token.lexeme}'"
         return cls(token.line, message, where)
 
     def __init__(self, line: int, message: str, where: str | None = None):
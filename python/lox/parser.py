@@ -1,11 +1,41 @@
 from dataclasses import dataclass, field
-from lox.tokens import Token, TokenType
+from lox.tokens import Token, TokenType, Tokens
 from lox.errors import LoxStaticError, LoxSyntaxError
 from lox.ast import *
 
+# Token types tested in the parser's hot paths. Module globals load faster than
+# enum attributes, and enum members are singletons, so they are compared by
+# identity.
+EOF = TokenType.EOF
+SEMICOLON = TokenType.SEMICOLON
+IDENTIFIER = TokenType.IDENTIFIER
+NUMBER = TokenType.NUMBER
+STRING = TokenType.STRING
+THIS = TokenType.THIS
+SUPER = TokenType.SUPER
+TRUE = TokenType.TRUE
+FALSE = TokenType.FALSE
+NIL = TokenType.NIL
+LEFT_PAREN = TokenType.LEFT_PAREN
+DOT = TokenType.DOT
+EQUAL = TokenType.EQUAL
+BANG = TokenType.BANG
+MINUS = TokenType.MINUS
+LEFT_BRACE = TokenType.LEFT_BRACE
+RIGHT_BRACE = TokenType.RIGHT_BRACE
+VAR = TokenType.VAR
+FUN = TokenType.FUN
+CLASS = TokenType.CLASS
+PRINT = TokenType.PRINT
+IF = TokenType.IF
+WHILE = TokenType.WHILE
+FOR = TokenType.FOR
+RETURN = TokenType.RETURN
 
-def parse(tokens: list[Token]) -> Stmt:
-    parser = Parser(tokens)
+
+def parse(tokens: Tokens) -> Stmt:
+    # Errors from the scanner are reported along with syntax errors.
+    parser = Parser(tokens, errors=list(tokens.errors))
     statements = []
     while not parser.is_at_end():
         try:
@@ -19,17 +49,51 @@ def parse(tokens: list[Token]) -> Stmt:
     return Program(statements)
 
 
-@dataclass
+# Bit mask with the token types that start a statement, where the parser can
+# resume after a syntax error.
+STATEMENT_START = sum(
+    1 << type
+    for type in (
+        TokenType.CLASS,
+        TokenType.FUN,
+        TokenType.VAR,
+        TokenType.FOR,
+        TokenType.IF,
+        TokenType.WHILE,
+        TokenType.PRINT,
+        TokenType.RETURN,
+    )
+)
+
+# Precedence and node class of the infix operators. Higher levels bind tighter
+# and all of them are left associative.
+INFIX_OPERATORS: dict[TokenType, tuple[int, type[Binary] | type[Logical]]] = {
+    TokenType.OR: (1, Logical),
+    TokenType.AND: (2, Logical),
+    TokenType.BANG_EQUAL: (3, Binary),
+    TokenType.EQUAL_EQUAL: (3, Binary),
+    TokenType.GREATER: (4, Binary),
+    TokenType.GREATER_EQUAL: (4, Binary),
+    TokenType.LESS: (4, Binary),
+    TokenType.LESS_EQUAL: (4, Binary),
+    TokenType.MINUS: (5, Binary),
+    TokenType.PLUS: (5, Binary),
+    TokenType.SLASH: (6, Binary),
+    TokenType.STAR: (6, Binary),
+}
+
+
+@dataclass(slots=True)
 class Parser:
-    tokens: list[Token]
+    tokens: Tokens
     current: int = 0
     errors: list[LoxSyntaxError] = field(default_factory=list)
+    types: list[TokenType] = field(init=False, repr=False)
 
     def __post_init__(self):
-        for token in self.tokens:
-            if token.type == "INVALID":
-                self.error(token, "Unexpected character.")
-        self.tokens = [t for t in self.tokens if t.type != "INVALID"]
+        # The cursor methods only look at token types, so they read the types
+        # column directly and never build a Token.
+        self.types = self.tokens.types
 
     #
     # Grammar rules
@@ -38,9 +102,11 @@ class Parser:
         return self.assignment()
     
     def assignment(self) -> Expr:
-        expr = self.logic_or()
-        if self.match("EQUAL"):
-            equals = self.previous()
+        expr = self.binary(1)
+        current = self.current
+        if self.types[current] is EQUAL:
+            self.current = current + 1
+            equals = self.tokens[current]
             value = self.assignment()
             if isinstance(expr, Variable):
                 name = expr.name
@@ -50,211 +116,192 @@ class Parser:
             self.error(equals, "Invalid assignment target.")
         return expr
 
-    def logic_or(self) -> Expr:
-        expr = self.logic_and()
-        while self.match("OR"):
-            operator = self.previous()
-            right = self.logic_and()
-            expr = Logical(expr, operator, right)
-        return expr
-    
-    def logic_and(self) -> Expr:
-        expr = self.equality()
-        while self.match("AND"):
-            operator = self.previous()
-            right = self.equality()
-            expr = Logical(expr, operator, right)
-        return expr
-
-    def equality(self) -> Expr:
-        expr = self.comparison()
-        while self.match("BANG_EQUAL", "EQUAL_EQUAL"):
-            operator = self.previous()
-            right = self.comparison()
-            expr = Binary(expr, operator, right)
-        return expr
-
-    def comparison(self) -> Expr:
-        expr = self.term()
-        while self.match("GREATER", "GREATER_EQUAL", "LESS", "LESS_EQUAL"):
-            operator = self.previous()
-            right = self.term()
-            expr = Binary(expr, operator, right)
-        return expr
-    
-    def term(self) -> Expr:
-        expr = self.factor()
-        while self.match("MINUS", "PLUS"):
-            operator = self.previous()
-            right = self.factor()
-            expr = Binary(expr, operator, right)
-        return expr
-    
-    def factor(self) -> Expr:
+    def binary(self, precedence: int) -> Expr:
+        """
+        Parse operands joined by infix operators that bind at least as tightly
+        as the given precedence.
+        """
         expr = self.unary()
-        while self.match("SLASH", "STAR"):
-            operator = self.previous()
-            right = self.unary()
-            expr = Binary(expr, operator, right)
-        return expr
-    
+        while True:
+            current = self.current
+            operator = INFIX_OPERATORS.get(self.types[current])
+            if operator is None or operator[0] < precedence:
+                return expr
+            level, node = operator
+            self.current = current + 1
+            right = self.binary(level + 1)
+            expr = node(expr, self.tokens[current], right)
+
     def unary(self) -> Expr:
-        if self.match("BANG", "MINUS"):
-            operator = self.previous()
+        current = self.current
+        kind = self.types[current]
+        if kind is BANG or kind is MINUS:
+            self.current = current + 1
+            operator = self.tokens[current]
             right = self.unary()
             return Unary(operator, right)
         return self.call()
     
     def call(self) -> Expr:
         expr = self.primary()
+        types = self.types
         while True:
-            if self.match("LEFT_PAREN"):
+            kind = types[self.current]
+            if kind is LEFT_PAREN:
+                self.current += 1
                 expr = self.finish_call(expr)
-            elif self.match("DOT"):
+            elif kind is DOT:
+                self.current += 1
                 msg = "Expect property name after '.'."
-                name = self.consume("IDENTIFIER", msg)
+                name = self.consume(TokenType.IDENTIFIER, msg)
                 expr = Get(expr, name)
             else:
-                break
-        return expr
+                return expr
     
     def finish_call(self, callee: Expr) -> Expr:
         arguments = []
-        if not self.check("RIGHT_PAREN"):
-            arguments.append(self.expression())
-            while self.match("COMMA"):
-                arguments.append(self.expression())
+        if not self.check(TokenType.RIGHT_PAREN):
+            append = arguments.append
+            append(self.expression())
+            while self.match(TokenType.COMMA):
+                append(self.expression())
                 if len(arguments) > 255:
                     self.error(self.previous(), "Can't have more than 255 arguments.")
-        paren = self.consume("RIGHT_PAREN", "Expect ')' after arguments.")
+        paren = self.consume(TokenType.RIGHT_PAREN, "Expect ')' after arguments.")
         return Call(callee, paren, arguments)
     
     def super_expression(self) -> Super:
-        keyword = self.consume("SUPER", "Expect 'super' keyword.")
-        self.consume("DOT", "Expect '.' after 'super'.")
-        method = self.consume("IDENTIFIER", "Expect superclass method name.")
+        keyword = self.consume(TokenType.SUPER, "Expect 'super' keyword.")
+        self.skip(TokenType.DOT, "Expect '.' after 'super'.")
+        method = self.consume(TokenType.IDENTIFIER, "Expect superclass method name.")
         return Super(keyword, method)
 
     def primary(self) -> Expr:
-        if self.match("FALSE"):
-            return Literal(False)
-        if self.match("TRUE"):
-            return Literal(True)
-        if self.match("NIL"):
-            return Literal(None)
-        if self.match("NUMBER", "STRING"):
-            return Literal(self.previous().literal)
-        if self.match("LEFT_PAREN"):
+        current = self.current
+        kind = self.types[current]
+        if kind is IDENTIFIER:
+            expr = Variable(self.tokens[current])
+        elif kind is NUMBER or kind is STRING:
+            expr = Literal(self.tokens.literals[current])
+        elif kind is THIS:
+            expr = This(self.tokens[current])
+        elif kind is LEFT_PAREN:
+            self.current = current + 1
             expr = self.expression()
-            self.consume("RIGHT_PAREN", "Expect ')' after expression.")
+            self.skip(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
             return Grouping(expr)
-        if self.match("IDENTIFIER"):
-            return Variable(self.previous())
-        if self.match("THIS"):
-            return This(self.previous())
-        if self.check("SUPER"):
+        elif kind is TRUE:
+            expr = Literal(True)
+        elif kind is FALSE:
+            expr = Literal(False)
+        elif kind is NIL:
+            expr = Literal(None)
+        elif kind is SUPER:
             return self.super_expression()
-        raise self.error(self.peek(), "Expect expression.")
+        else:
+            raise self.error(self.tokens[current], "Expect expression.")
+        self.current = current + 1
+        return expr
 
     #
     # Statements
     #
     def declaration(self):
-        match self.peek().type:
-            case "VAR":
-                return self.var_declaration()
-            case "FUN":
-                self.consume("FUN", "Expect function declaration.")
-                return self.function("function")
-            case "CLASS":
-                return self.class_declaration()
-            case _:
-                return self.statement()
-    
+        kind = self.types[self.current]
+        if kind is VAR:
+            return self.var_declaration()
+        elif kind is FUN:
+            self.skip(TokenType.FUN, "Expect function declaration.")
+            return self.function("function")
+        elif kind is CLASS:
+            return self.class_declaration()
+        return self.statement()
+
     def statement(self) -> Stmt:
-        match self.peek().type:
-            case "PRINT":
-                return self.print_statement()
-            case "LEFT_BRACE":
-                return self.block_statement()
-            case "IF":
-                return self.if_statement()
-            case "WHILE":
-                return self.while_statement()
-            case "FOR":
-                return self.for_statement()
-            case "RETURN":
-                return self.return_statement()
-            case _:
-                return self.expression_statement()
+        kind = self.types[self.current]
+        if kind is PRINT:
+            return self.print_statement()
+        elif kind is LEFT_BRACE:
+            return self.block_statement()
+        elif kind is IF:
+            return self.if_statement()
+        elif kind is WHILE:
+            return self.while_statement()
+        elif kind is FOR:
+            return self.for_statement()
+        elif kind is RETURN:
+            return self.return_statement()
+        return self.expression_statement()
 
     def print_statement(self) -> Stmt:
-        self.consume("PRINT", "Expect 'print' keyword.")
+        self.skip(TokenType.PRINT, "Expect 'print' keyword.")
         value = self.expression()
-        self.consume("SEMICOLON", "Expect ';' after value.")
+        self.skip(TokenType.SEMICOLON, "Expect ';' after value.")
         return Print(value)
 
     def expression_statement(self) -> Stmt:
         expr = self.expression()
-        self.consume("SEMICOLON", "Expect ';' after expression.")
+        self.skip(TokenType.SEMICOLON, "Expect ';' after expression.")
         return Expression(expr)
     
     def var_declaration(self) -> Var:
-        self.consume("VAR", "Expect 'var' keyword.")
-        name = self.consume("IDENTIFIER", "Expect variable name.")
+        self.skip(TokenType.VAR, "Expect 'var' keyword.")
+        name = self.consume(TokenType.IDENTIFIER, "Expect variable name.")
 
-        if self.match("EQUAL"):
+        if self.match(TokenType.EQUAL):
             initializer = self.expression()
         else:
             initializer = Literal(None)
 
-        self.consume("SEMICOLON", "Expect ';' after variable declaration.")
+        self.skip(TokenType.SEMICOLON, "Expect ';' after variable declaration.")
         return Var(name, initializer)
 
     def block_statement(self) -> Block:
-        self.consume("LEFT_BRACE", "Expect '{' to open block.")
+        self.skip(TokenType.LEFT_BRACE, "Expect '{' to open block.")
         statements: list[Stmt] = []
-        while not self.check("RIGHT_BRACE") and not self.is_at_end():
-            statements.append(self.declaration())
-        self.consume("RIGHT_BRACE", "Expect '}' after block.")
+        append = statements.append
+        types = self.types
+        while (kind := types[self.current]) is not RIGHT_BRACE and kind is not EOF:
+            append(self.declaration())
+        self.skip(TokenType.RIGHT_BRACE, "Expect '}' after block.")
         return Block(statements)
     
     def if_statement(self) -> If:
-        self.consume("IF", "Expect 'if'.")
-        self.consume("LEFT_PAREN", "Expect '(' after 'if'.")
+        self.skip(TokenType.IF, "Expect 'if'.")
+        self.skip(TokenType.LEFT_PAREN, "Expect '(' after 'if'.")
         condition = self.expression()
-        self.consume("RIGHT_PAREN", "Expect ')' after if condition.")
+        self.skip(TokenType.RIGHT_PAREN, "Expect ')' after if condition.")
         then_branch = self.statement()
         else_branch = None
-        if self.match("ELSE"):
+        if self.match(TokenType.ELSE):
             else_branch = self.statement()
         return If(condition, then_branch, else_branch)
     
     def while_statement(self) -> While:
-        self.consume("WHILE", "Expect 'while'.")
-        self.consume("LEFT_PAREN", "Expect '(' after 'while'.")
+        self.skip(TokenType.WHILE, "Expect 'while'.")
+        self.skip(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
         condition = self.expression()
-        self.consume("RIGHT_PAREN", "Expect ')' after condition.")
+        self.skip(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
         body = self.statement()
         return While(condition, body)
     
     def for_statement(self):
-        self.consume("FOR", "Expect 'for'.")
-        self.consume("LEFT_PAREN", "Expect '(' after 'for'.")
-        if self.match("SEMICOLON"):
+        self.skip(TokenType.FOR, "Expect 'for'.")
+        self.skip(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
+        if self.match(TokenType.SEMICOLON):
             initializer = None
-        elif self.check("VAR"):
+        elif self.check(TokenType.VAR):
             initializer = self.var_declaration()
         else:
             initializer = self.expression_statement()
         condition = None
-        if not self.check("SEMICOLON"):
+        if not self.check(TokenType.SEMICOLON):
             condition = self.expression()
-        self.consume("SEMICOLON", "Expect ';' after loop condition.")
+        self.skip(TokenType.SEMICOLON, "Expect ';' after loop condition.")
         increment = None
-        if not self.check("RIGHT_PAREN"):
+        if not self.check(TokenType.RIGHT_PAREN):
             increment = self.expression()
-        self.consume("RIGHT_PAREN", "Expect ')' after for clauses.")
+        self.skip(TokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
         body = self.statement()
         
         if increment is not None:
@@ -267,46 +314,49 @@ class Parser:
         return body
     
     def function(self, kind: str) -> Stmt:
-        name = self.consume("IDENTIFIER", f"Expect {kind} name.")
-        self.consume("LEFT_PAREN", f"Expect '(' after {kind} name.")
+        name = self.consume(TokenType.IDENTIFIER, f"Expect {kind} name.")
+        self.skip(TokenType.LEFT_PAREN, f"Expect '(' after {kind} name.")
         parameters = []
-        if not self.check("RIGHT_PAREN"):
-            argument = self.consume("IDENTIFIER", "Expect parameter name.")
-            parameters.append(argument)
-            while self.match("COMMA"):
-                argument = self.consume("IDENTIFIER", "Expect parameter name.")
-                parameters.append(argument)
+        if not self.check(TokenType.RIGHT_PAREN):
+            append = parameters.append
+            argument = self.consume(TokenType.IDENTIFIER, "Expect parameter name.")
+            append(argument)
+            while self.match(TokenType.COMMA):
+                argument = self.consume(TokenType.IDENTIFIER, "Expect parameter name.")
+                append(argument)
                 if len(parameters) > 255:
                     self.error(argument, "Can't have more than 255 parameters.")
-        self.consume("RIGHT_PAREN", "Expect ')' after parameters.")
-        if self.check("LEFT_BRACE"):
+        self.skip(TokenType.RIGHT_PAREN, "Expect ')' after parameters.")
+        if self.check(TokenType.LEFT_BRACE):
             body = self.block_statement()
         else:
             raise self.error(self.peek(), "Expect '{' before function body.")
         return Function(name, parameters, body.statements)
 
     def return_statement(self):
-        keyword = self.consume("RETURN", "Expect 'return' keyword.")
+        keyword = self.consume(TokenType.RETURN, "Expect 'return' keyword.")
         value = None
-        if not self.check("SEMICOLON"):
+        if not self.check(TokenType.SEMICOLON):
             value = self.expression()
-        self.consume("SEMICOLON", "Expect ';' after return value.")
+        self.skip(TokenType.SEMICOLON, "Expect ';' after return value.")
         return Return(keyword, value)
 
     def class_declaration(self) -> Class:
-        self.consume("CLASS", "Expect 'class' keyword.")
-        class_name = self.consume("IDENTIFIER", "Expect class name.")
+        self.skip(TokenType.CLASS, "Expect 'class' keyword.")
+        class_name = self.consume(TokenType.IDENTIFIER, "Expect class name.")
         
         superclass = None
-        if self.match("LESS"):
-            name = self.consume("IDENTIFIER", "Expect superclass name.")
+        if self.match(TokenType.LESS):
+            name = self.consume(TokenType.IDENTIFIER, "Expect superclass name.")
             superclass = Variable(name)
 
         methods = []
-        self.consume("LEFT_BRACE", "Expect '{' before class body.")
-        while not self.check("RIGHT_BRACE"):
-            methods.append(self.function("method"))
-        self.consume("RIGHT_BRACE", "Expect '}' after class body.")
+        self.skip(TokenType.LEFT_BRACE, "Expect '{' before class body.")
+        append = methods.append
+        types = self.types
+        while types[self.current] is not RIGHT_BRACE:
+            append(self.function("method"))
+        self.skip(TokenType.RIGHT_BRACE, "Expect '}' after class body.")
         
         return Class(class_name, superclass, methods=methods)
     
@@ -314,22 +364,22 @@ class Parser:
     # Utilities
     # 
     def match(self, *types: TokenType) -> bool:
+        current = self.current
+        kind = self.types[current]
+        if kind is EOF:
+            return False
         for type in types:
-            if self.check(type):
-                self.advance()
+            if kind is type:
+                self.current = current + 1
                 return True
         return False
 
     def check(self, type: TokenType) -> bool:
-        return not self.is_at_end() and self.peek().type == type
+        kind = self.types[self.current]
+        return kind is type and kind is not EOF
 
-    def advance(self) -> Token:
-        if not self.is_at_end():
-            self.current += 1
-        return self.previous()
-    
     def is_at_end(self) -> bool:
-        return self.peek().type == "EOF"
+        return self.types[self.current] is EOF
 
     def peek(self) -> Token:
         return self.tokens[self.current]
@@ -338,22 +388,39 @@ class Parser:
         return self.tokens[self.current - 1]
     
     def consume(self, type: TokenType, message: str) -> Token:
-        if self.check(type):
-            return self.advance()
-        raise self.error(self.peek(), message)
+        current = self.current
+        kind = self.types[current]
+        if kind is not type or kind is EOF:
+            raise self.error(self.tokens[current], message)
+        self.current = current + 1
+        return self.tokens[current]
     
+    def skip(self, type: TokenType, message: str) -> None:
+        """
+        Like consume(), for tokens that are not stored in the AST and so never
+        need a Token object.
+        """
+        current = self.current
+        kind = self.types[current]
+        if kind is not type or kind is EOF:
+            raise self.error(self.tokens[current], message)
+        self.current = current + 1
+
     def error(self, token: Token, message: str):
         error = LoxSyntaxError.from_token(token, message)
         self.errors.append(error)
         return error
 
     def synchronize(self):
-        self.advance()
-        boundary_tokens = {"CLASS", "FUN", "VAR", "FOR", "IF", "WHILE", "PRINT", "RETURN"}
-
-        while not self.is_at_end():
-            if self.previous().type == "SEMICOLON":
-                return
-            if self.peek().type in boundary_tokens:
-                return
-            self.advance()
+        # Walk the token types directly: skipped tokens never need a Token.
+        types = self.types
+        current = self.current
+        if types[current] is not EOF:
+            current += 1
+        while types[current] is not EOF:
+            if types[current - 1] is SEMICOLON:
+                break
+            if (1 << types[current]) & STATEMENT_START:
+                break
+            current += 1
+        self.current = current
@@ -1,27 +1,27 @@
-from functools import singledispatch
+from typing import Callable
 
 from lox.ast import Binary, Expr, Grouping, Literal, Unary
-from lox.tokens import Token
+from lox.tokens import Token, TokenType
 
 
-@singledispatch
 def pretty(expr: Expr) -> str:
-    raise TypeError(f"cannot display {expr.__class__.__name__} objects")
+    try:
+        printer = PRINTERS[type(expr)]
+    except KeyError:
+        raise TypeError(f"cannot display {expr.__class__.__name__} objects") from None
+    return printer(expr)
 
 
-@pretty.register
-def _(expr: Binary):
+def pretty_binary(expr: Binary):
     symbol = expr.operator.lexeme
     return parenthesize(symbol, expr.left, expr.right)
 
 
-@pretty.register
-def _(expr: Grouping):
+def pretty_grouping(expr: Grouping):
     return parenthesize("group", expr.expression)
 
 
-@pretty.register
-def _(expr: Literal):
+def pretty_literal(expr: Literal):
     if expr.value is None:
         return "nil"
     elif expr.value is True:
@@ -31,20 +31,27 @@ def _(expr: Literal):
     return str(expr.value)
 
 
-@pretty.register
-def _(expr: Unary):
+def pretty_unary(expr: Unary):
     symbol = expr.operator.lexeme
     return parenthesize(symbol, expr.right)
 
 
+PRINTERS: dict[type[Expr], Callable[..., str]] = {
+    Binary: pretty_binary,
+    Grouping: pretty_grouping,
+    Literal: pretty_literal,
+    Unary: pretty_unary,
+}
+
+
 def parenthesize(name: str, *exprs: Expr) -> str:
     parts = [name, *map(pretty, exprs)]
     return "(" + " ".join(parts) + ")"
 
 
 def main():
-    minus = Token("MINUS", "-", 1)
-    star = Token("STAR", "*", 1)
+    minus = Token(TokenType.MINUS, "-", 1)
+    star = Token(TokenType.STAR, "*", 1)
     expr = Binary(Unary(minus, Literal(123)), star, Grouping(Literal(45.67)))
     print(pretty(expr))
 
@@ -1,12 +1,9 @@
 # lox/env.py
 from __future__ import annotations
-from copy import deepcopy
-from dataclasses import dataclass, field
-from typing import Literal as Enum
-from functools import singledispatch
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Literal as Enum
 
 from lox.ast import *
-from lox import env
 from lox.tokens import Token
 from lox.errors import LoxStaticError, LoxSyntaxError
 
@@ -14,19 +11,36 @@ type FunctionContext = Enum["FUNCTION", "METHOD", "INITIALIZER", None]
 type ClassContext = Enum["CLASS", "SUBCLASS", None]
 type Resolution = Enum["DECLARED", "DEFINED"]
 
-def resolve(program: Program) -> Program:
-    env = Env()
-    program = deepcopy(program)
+def resolve(program: Program, globals: Any) -> Program:
+    """
+    Resolve variables in program.
+
+    The nodes are annotated in place and the same program is returned. Locals
+    get slot indexes and references to globals are bound directly to their
+    cells in the runtime global environment (see interpreter.Env.global_cell).
+    """
+    env = Env(globals=globals)
     resolve_node(program, env)
     if env.errors:
         raise LoxStaticError(env.errors)
     return program
 
-@dataclass
-class Env(env.Env[Resolution]):
+@dataclass(slots=True)
+class Env:
+    values: dict[str, Resolution] = field(default_factory=dict)
+    enclosing: Env | None = None
     function_context : FunctionContext = None
     class_context: ClassContext = None
     errors: list[Exception] = field(default_factory=list)
+    globals: Any = None
+    indexes: dict[str, int] = field(default_factory=dict)
+
+    def __setitem__(self, name: str, value: Resolution) -> None:
+        # Locals get slots in declaration order. Redeclaring a name in the
+        # same scope keeps its first slot.
+        if name not in self.indexes:
+            self.indexes[name] = len(self.indexes)
+        self.values[name] = value
 
     def declare(self, name: Token) -> None:
         if not self.enclosing:
@@ -49,53 +63,121 @@ class Env(env.Env[Resolution]):
         kwargs.setdefault("class_context", self.class_context)
         return Env(enclosing=self, errors=self.errors, **kwargs)
 
-    def get_depth(self, name: str) -> int:
-        if name in self.values or self.enclosing is None:
-            return 0
-        return 1 + self.enclosing.get_depth(name)
+    def find_scope(self, name: str) -> tuple[int, Env]:
+        """
+        Return the innermost scope that declares name and how many scopes
+        away it is. Undeclared names resolve to the root scope.
+        """
+        scope = self
+        depth = 0
+        while name not in scope.values and scope.enclosing is not None:
+            scope = scope.enclosing
+            depth += 1
+        return depth, scope
+
+    def get_cell(self, name: str) -> list | None:
+        """
+        Cell of a global declared or referenced from the root scope.
+        """
+        if self.enclosing is None:
+            return self.globals.global_cell(name)
+        return None
+
+    def get_slot(self, name: str) -> int | None:
+        """
+        Index of a name declared in this scope, in declaration order.
+
+        Globals are stored by name and have no slot.
+        """
+        if self.enclosing is None:
+            return None
+        return self.indexes[name]
 
-@singledispatch
-def resolve_node(node: Expr | Stmt, env: Env) -> None:
-    for child in vars(node).values():
+def resolve_node(node: Expr | Stmt | list, env: Env) -> None:
+    resolver = RESOLVERS.get(type(node), resolve_children)
+    resolver(node, env)
+
+def resolve_children(node: Expr | Stmt, env: Env) -> None:
+    for f in fields(node):
+        child = getattr(node, f.name)
         if isinstance(child, (Stmt, Expr, list)):
             resolve_node(child, env)
 
-@resolve_node.register
-def _(stmts: list, env: Env) -> None:
+def resolve_list(stmts: list, env: Env) -> None:
     for stmt in stmts:
         resolve_node(stmt, env)
 
-@resolve_node.register
-def _(stmt: Var, env: Env) -> None:
+def resolve_nothing(node: Expr | Stmt, env: Env) -> None:
+    pass
+
+def resolve_operands(expr: Binary | Logical, env: Env) -> None:
+    resolve_node(expr.left, env)
+    resolve_node(expr.right, env)
+
+def resolve_grouping(expr: Grouping, env: Env) -> None:
+    resolve_node(expr.expression, env)
+
+def resolve_unary(expr: Unary, env: Env) -> None:
+    resolve_node(expr.right, env)
+
+def resolve_call(expr: Call, env: Env) -> None:
+    resolve_node(expr.callee, env)
+    for argument in expr.arguments:
+        resolve_node(argument, env)
+
+def resolve_get(expr: Get, env: Env) -> None:
+    resolve_node(expr.object, env)
+
+def resolve_set(expr: Set, env: Env) -> None:
+    resolve_node(expr.object, env)
+    resolve_node(expr.value, env)
+
+def resolve_program(stmt: Program | Block, env: Env) -> None:
+    for child in stmt.statements:
+        resolve_node(child, env)
+
+def resolve_expression(stmt: Expression | Print, env: Env) -> None:
+    resolve_node(stmt.expression, env)
+
+def resolve_if(stmt: If, env: Env) -> None:
+    resolve_node(stmt.condition, env)
+    resolve_node(stmt.then_branch, env)
+    if stmt.else_branch is not None:
+        resolve_node(stmt.else_branch, env)
+
+def resolve_while(stmt: While, env: Env) -> None:
+    resolve_node(stmt.condition, env)
+    resolve_node(stmt.body, env)
+
+def resolve_var(stmt: Var, env: Env) -> None:
     env.declare(stmt.name)
+    stmt.slot = env.get_slot(stmt.name.lexeme)
+    stmt.cell = env.get_cell(stmt.name.lexeme)
     if stmt.initializer is not None:
         resolve_node(stmt.initializer, env)
     env.define(stmt.name)
 
-@resolve_node.register
-def _(expr: Variable, env: Env) -> None:
+def resolve_variable(expr: Variable, env: Env) -> None:
     if env.values.get(expr.name.lexeme) == "DECLARED":
         msg = "Can't read local variable in its own initializer."
         env.error(expr.name, msg)
     resolve_local(expr, expr.name, env)
 
-@resolve_node.register
-def _(expr: Assign, env: Env) -> None:
+def resolve_assign(expr: Assign, env: Env) -> None:
     resolve_node(expr.value, env)
     resolve_local(expr, expr.name, env)
 
-@resolve_node.register
-def _(stmt: Block, env: Env) -> None:
+def resolve_block(stmt: Block, env: Env) -> None:
     resolve_node(stmt.statements, env.push())
 
-@resolve_node.register
-def _(stmt: Function, env: Env) -> None:
+def resolve_function_declaration(stmt: Function, env: Env) -> None:
     env.declare(stmt.name)
     env.define(stmt.name)
+    stmt.slot = env.get_slot(stmt.name.lexeme)
+    stmt.cell = env.get_cell(stmt.name.lexeme)
     resolve_function(stmt, "FUNCTION", env)
 
-@resolve_node.register
-def _(stmt: Return, env: Env) -> None:
+def resolve_return(stmt: Return, env: Env) -> None:
     if env.function_context is None: 
         env.error(stmt.keyword, "Can't return from top-level code.")
     if stmt.value is not None:
@@ -104,10 +186,11 @@ def _(stmt: Return, env: Env) -> None:
             env.error(stmt.keyword, msg)
         resolve_node(stmt.value, env)
 
-@resolve_node.register
-def _(stmt: Class, env: Env):
+def resolve_class(stmt: Class, env: Env) -> None:
     env.declare(stmt.name)
     env.define(stmt.name)
+    stmt.slot = env.get_slot(stmt.name.lexeme)
+    stmt.cell = env.get_cell(stmt.name.lexeme)
     current_context = env.class_context
     env.class_context = "CLASS"
 
@@ -130,15 +213,13 @@ def _(stmt: Class, env: Env):
 
     env.class_context = current_context
 
-@resolve_node.register
-def _(expr: This, env: Env) -> None:
+def resolve_this(expr: This, env: Env) -> None:
     if env.class_context is None:
         msg = "Can't use 'this' outside of a class."
         env.error(expr.keyword, msg)
     resolve_local(expr, expr.keyword, env)
 
-@resolve_node.register
-def _(expr: Super, env: Env) -> None:
+def resolve_super(expr: Super, env: Env) -> None:
     if env.class_context is None:
         msg = "Can't use 'super' outside of a class."
         env.error(expr.keyword, msg)
@@ -156,4 +237,33 @@ def resolve_function(function: Function, type: FunctionContext, env: Env) -> Non
 
 def resolve_local(expr: Expr, name: Token, env: Env) -> None:
     assert hasattr(expr, 'depth'), f"expr {expr.__class__.__name__} must have depth attribute"
-    expr.depth = env.get_depth(name.lexeme)
+    expr.depth, scope = env.find_scope(name.lexeme)
+    expr.slot = scope.get_slot(name.lexeme)
+    if hasattr(expr, "cell"):
+        expr.cell = scope.get_cell(name.lexeme)
+
+RESOLVERS: dict[type, Callable[[Any, Env], None]] = {
+    list: resolve_list,
+    Literal: resolve_nothing,
+    Binary: resolve_operands,
+    Logical: resolve_operands,
+    Grouping: resolve_grouping,
+    Unary: resolve_unary,
+    Call: resolve_call,
+    Get: resolve_get,
+    Set: resolve_set,
+    Program: resolve_program,
+    Expression: resolve_expression,
+    Print: resolve_expression,
+    If: resolve_if,
+    While: resolve_while,
+    Var: resolve_var,
+    Variable: resolve_variable,
+    Assign: resolve_assign,
+    Block: resolve_block,
+    Function: resolve_function_declaration,
+    Return: resolve_return,
+    Class: resolve_class,
+    This: resolve_this,
+    Super: resolve_super,
+}
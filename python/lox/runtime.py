@@ -1,89 +1,143 @@
 from __future__ import annotations
 import abc
-from dataclasses import dataclass, field
-from typing import Callable
+from dataclasses import dataclass, field, replace
+from typing import Callable, Sequence
 from lox.ast import Function
 from lox import env, interpreter
 from lox.errors import LoxRuntimeError
-from lox.tokens import Token
 
 type Value = interpreter.Value
 type Env = env.Env[Value]
 
 
 class LoxCallable(abc.ABC):
+    __slots__ = ()
     arity: int
     
     @abc.abstractmethod
     def call(self,
              env: Env,
-             arguments: list[Value]) -> Value:
+             arguments: Sequence[Value]) -> Value:
         ...
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class NativeFunction(LoxCallable):
     function: Callable[..., Value]
     arity: int
 
     def call(self,
              env: Env,
-             arguments: list[Value]) -> Value:
+             arguments: Sequence[Value]) -> Value:
         return self.function(*arguments)
 
     def __str__(self) -> str:
         return "<native fn>"
     
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class LoxFunction(LoxCallable):
     declaration: Function
     closure: Env
+    body: Callable[[Env], LoxReturn | None]
     is_initializer: bool = False
+    locals: int = 0
+    # Call frames that can be reused once a call returns, shared by all
+    # functions compiled from the same declaration. None disables reuse.
+    pool: list[Env] | None = None
+    arity: int = field(init=False)
 
-    @property
-    def arity(self) -> int:
-        return len(self.declaration.params)
+    def __post_init__(self):
+        self.arity = len(self.declaration.params)
 
     def call(self,
              env: Env,
-             arguments: list[Value]) -> Value:
-        env = self.closure.push()
-        for param, arg in zip(self.declaration.params, arguments):
-            env[param.lexeme] = arg
+             arguments: Sequence[Value]) -> Value:
+        pool = self.pool
+        if pool:
+            env = pool.pop()
+            env.enclosing = self.closure
+            env.slots[: len(arguments)] = arguments
+        else:
+            slots = list(arguments)
+            if self.locals:
+                slots.extend([None] * self.locals)
+            env = self.closure.push_frame(slots)
 
         try:
-            for stmt in self.declaration.body:
-                interpreter.exec(stmt, env)
-        except LoxReturn as result:
-            if self.is_initializer:
-                return self.closure.get_at(0, "this")
-            return result.value
+            result = self.body(env)
         except RecursionError:
             msg = "Stack overflow."
             raise LoxRuntimeError(msg, self.declaration.name)
+        if pool is not None:
+            pool.append(env)
         if self.is_initializer:
-            return self.closure.get_at(0, "this")
+            return self.closure.slots[0]
+        if result is not None:
+            return result.value
     
     def bind(self, instance: LoxInstance) -> LoxFunction:
-        env = self.closure.push()
-        env["this"] = instance
-        return LoxFunction(self.declaration, env, self.is_initializer)
+        env = self.closure.push_frame([instance])
+        return replace(self, closure=env)
 
     def __str__(self) -> str:
         return f"<fn {self.declaration.name.lexeme}>"
    
-class LoxReturn(Exception):
-    def __init__(self, value):
-        super().__init__()
+class LoxReturn:
+    """
+    Outcome of executing a return statement.
+
+    Statements return None when execution falls through, and a LoxReturn when
+    a return statement ran. Enclosing statements pass it up unchanged until it
+    reaches the function call.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Value):
         self.value = value
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
+class Shape:
+    """
+    Layout of the fields of an instance.
+
+    Instances of a class start with the class' root shape and move to a new
+    shape whenever they gain a field. Shapes are memoized, so instances that
+    received the same fields in the same order share a shape and store their
+    values at the same slots. That lets call sites cache where a property
+    lives using a single identity check on the shape.
+    """
+
+    fields: dict[str, int] = field(default_factory=dict)
+    transitions: dict[str, Shape] = field(default_factory=dict)
+
+    def add(self, name: str) -> Shape:
+        """
+        Shape obtained by adding a new field to this one.
+        """
+        shape = self.transitions.get(name)
+        if shape is None:
+            fields = {**self.fields, name: len(self.fields)}
+            shape = self.transitions[name] = Shape(fields)
+        return shape
+
+
+@dataclass(eq=False, slots=True)
 class LoxClass(LoxCallable):
     name: str
     superclass: LoxClass | None = None
     methods: dict[str, LoxFunction] = field(default_factory=dict)
+    shape: Shape = field(default_factory=Shape)
+    # Own and inherited methods, flattened when the class is created.
+    method_table: dict[str, LoxFunction] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.superclass is None:
+            self.method_table = dict(self.methods)
+        else:
+            self.method_table = {**self.superclass.method_table, **self.methods}
 
     @property
     def arity(self) -> int:
@@ -95,7 +149,7 @@ class LoxClass(LoxCallable):
     def __str__(self) -> str:
         return self.name
     
-    def call(self, env: Env, arguments: list[Value]) -> LoxInstance:
+    def call(self, env: Env, arguments: Sequence[Value]) -> LoxInstance:
         instance = LoxInstance(self)
         init = self.find_method("init")
         if init is not None:
@@ -103,26 +157,16 @@ class LoxClass(LoxCallable):
         return instance
         
     def find_method(self, name: str) -> LoxFunction | None:
-        if method := self.methods.get(name):
-            return method
-        if self.superclass is not None:
-            return self.superclass.find_method(name)
+        return self.method_table.get(name)
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class LoxInstance:
     klass: LoxClass
-    fields: dict[str, Value] = field(default_factory=dict)
+    shape: Shape = field(init=False)
+    slots: list[Value] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.shape = self.klass.shape
 
     def __str__(self) -> str:
         return f"{self.klass.name} instance"
-    
-    def get(self, name: Token) -> Value:
-        if name.lexeme in self.fields:
-            return self.fields[name.lexeme]
-        method = self.klass.find_method(name.lexeme)
-        if method is not None:
-            return method.bind(self)
-        raise LoxRuntimeError(f"Undefined property '{name.lexeme}'.", name)
-
-    def set(self, name: Token, value: Value) -> None:
-        self.fields[name.lexeme] = value
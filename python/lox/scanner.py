@@ -1,184 +1,118 @@
+import re
+import sys
 from dataclasses import dataclass, field
-from typing import Any
 
-from lox.tokens import Token, TokenType
+from lox.tokens import TokenType, Tokens
 from lox.errors import LoxSyntaxError
 
 KEYWORDS = {
-    "and",
-    "class",
-    "else",
-    "false",
-    "for",
-    "fun",
-    "if",
-    "nil",
-    "or",
-    "print",
-    "return",
-    "super",
-    "this",
-    "true",
-    "var",
-    "while",
+    "and": TokenType.AND,
+    "class": TokenType.CLASS,
+    "else": TokenType.ELSE,
+    "false": TokenType.FALSE,
+    "for": TokenType.FOR,
+    "fun": TokenType.FUN,
+    "if": TokenType.IF,
+    "nil": TokenType.NIL,
+    "or": TokenType.OR,
+    "print": TokenType.PRINT,
+    "return": TokenType.RETURN,
+    "super": TokenType.SUPER,
+    "this": TokenType.THIS,
+    "true": TokenType.TRUE,
+    "var": TokenType.VAR,
+    "while": TokenType.WHILE,
 }
 
 
-@dataclass
+OPERATORS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+    "/": TokenType.SLASH,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+}
+
+# Operators map to their type and to the lexeme stored in the table, so every
+# occurrence of an operator shares a single string, like interned names do.
+OPERATOR_TOKENS = {lexeme: (type, lexeme) for lexeme, type in OPERATORS.items()}
+
+# A single alternation matches every lexeme, so the loop over characters runs
+# inside the regex engine. Blanks before a lexeme are consumed as part of its
+# match. Branches are ordered so comments win over slashes and any other
+# character falls through to INVALID.
+TOKEN_REGEX = re.compile(
+    r"""
+    [ \t\r]*
+    (?:
+      (?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<COMMENT>//[^\n]*)
+    | (?P<OPERATOR>[!=<>]=?|[(){},.\-+;*/])
+    | (?P<NEWLINE>\n(?:[ \t\r]*\n)*)
+    | (?P<NUMBER>[0-9]+(?:\.[0-9]+)?)
+    | (?P<STRING>"[^"]*")
+    | (?P<UNTERMINATED_STRING>"[^"]*)
+    | (?P<INVALID>[^ \t\r\n])
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+@dataclass(slots=True)
 class Scanner:
     source: str
-    start: int = 0
-    current: int = 0
     line: int = 1
-    tokens: list[Token] = field(default_factory=list)
-
-    def scan_tokens(self) -> list[Token]:
-        while not self.is_at_end():
-            # We are at the beginning of the next lexeme.
-            self.start = self.current
-            self.scan_token()
-        self.tokens.append(Token("EOF", "", self.line))
+    tokens: Tokens = field(default_factory=Tokens)
+
+    def scan_tokens(self) -> Tokens:
+        append = self.tokens.append
+        line = self.line
+        for match in TOKEN_REGEX.finditer(self.source):
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == "IDENTIFIER":
+                # Interned names make the dict lookups in environments,
+                # classes and shapes compare keys by identity.
+                text = sys.intern(text)
+                append(KEYWORDS.get(text, TokenType.IDENTIFIER), text, line)
+            elif kind == "OPERATOR":
+                type, text = OPERATOR_TOKENS[text]
+                append(type, text, line)
+            elif kind == "NEWLINE":
+                line += text.count("\n")
+            elif kind == "COMMENT":
+                pass
+            elif kind == "NUMBER":
+                append(TokenType.NUMBER, text, line, float(text))
+            elif kind == "STRING":
+                line += text.count("\n")
+                append(TokenType.STRING, text, line, text[1:-1])
+            elif kind == "UNTERMINATED_STRING":
+                self.line = line + text.count("\n")
+                raise LoxSyntaxError(self.line, "Unterminated string.")
+            else:
+                error = LoxSyntaxError(line, "Unexpected character.", f"at '{text}'")
+                self.tokens.errors.append(error)
+        self.line = line
+        append(TokenType.EOF, "", line)
         return self.tokens
 
-    def is_at_end(self) -> bool:
-        return self.current >= len(self.source)
-
-    def scan_token(self):
-        match self.advance():
-            case "(":
-                self.add_token("LEFT_PAREN")
-            case ")":
-                self.add_token("RIGHT_PAREN")
-            case "{":
-                self.add_token("LEFT_BRACE")
-            case "}":
-                self.add_token("RIGHT_BRACE")
-            case ",":
-                self.add_token("COMMA")
-            case ".":
-                self.add_token("DOT")
-            case "-":
-                self.add_token("MINUS")
-            case "+":
-                self.add_token("PLUS")
-            case ";":
-                self.add_token("SEMICOLON")
-            case "*":
-                self.add_token("STAR")
-            case "!" if self.match("="):
-                self.add_token("BANG_EQUAL")
-            case "!":
-                self.add_token("BANG")
-            case "=" if self.match("="):
-                self.add_token("EQUAL_EQUAL")
-            case "=":
-                self.add_token("EQUAL")
-            case "<" if self.match("="):
-                self.add_token("LESS_EQUAL")
-            case "<":
-                self.add_token("LESS")
-            case ">" if self.match("="):
-                self.add_token("GREATER_EQUAL")
-            case ">":
-                self.add_token("GREATER")
-            case "/" if self.match("/"):
-                # A comment goes until the end of the line.
-                while self.peek() != "\n" and not self.is_at_end():
-                    self.advance()
-            case "/":
-                self.add_token("SLASH")
-            case " " | "\r" | "\t":
-                pass  # Ignore whitespace.
-            case "\n":
-                self.line += 1
-            case '"':
-                self.string()
-            case "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9":
-                self.number()
-            case c if is_alpha(c):
-                self.identifier()
-            case _:
-                self.add_token("INVALID")
-
-    def advance(self) -> str:
-        char = self.source[self.current]
-        self.current += 1
-        return char
-
-    def add_token(self, type: TokenType, literal: Any = None):
-        text = self.source[self.start : self.current]
-        self.tokens.append(Token(type, text, self.line, literal))
-
-    def match(self, expected: str) -> bool:
-        if self.is_at_end() or self.source[self.current] != expected:
-            return False
-        self.current += 1
-        return True
-
-    def peek(self) -> str:
-        if self.is_at_end():
-            return ""
-        return self.source[self.current]
-
-    def peek_next(self):
-        if self.current + 1 >= len(self.source):
-            return "\0"
-        return self.source[self.current + 1]
-
-    def string(self):
-        while self.peek() != '"' and not self.is_at_end():
-            if self.peek() == "\n":
-                self.line += 1
-            self.advance()
-
-        # FIX THIS
-        if self.is_at_end():
-            raise LoxSyntaxError(self.line, "Unterminated string.")
-
-        # The closing ".
-        self.advance()
-
-        # Trim the surrounding quotes.
-        value = self.source[self.start + 1 : self.current - 1]
-        self.add_token("STRING", value)
-
-    def number(self):
-        while is_digit(self.peek()):
-            self.advance()
-
-        # Look for a fractional part.
-        if self.peek() == "." and is_digit(self.peek_next()):
-            # Consume the "."
-            self.advance()
-
-        while is_digit(self.peek()):
-            self.advance()
-
-        substring = self.source[self.start : self.current]
-        self.add_token("NUMBER", float(substring))
-
-    def identifier(self):
-        while is_alpha_numeric(self.peek()):
-            self.advance()
-        text = self.source[self.start : self.current]
-        kind = "IDENTIFIER"
-        if text in KEYWORDS:
-            kind = text.upper()
-        self.add_token(kind)
-
-
-def is_digit(char: str) -> bool:
-    return char.isdigit() and char.isascii()
-
-
-def is_alpha(char: str) -> bool:
-    return char == "_" or char.isalpha() and char.isascii()
-
-
-def is_alpha_numeric(char: str) -> bool:
-    return is_alpha(char) or is_digit(char)
-
 
-def tokenize(source: str) -> list[Token]:
+def tokenize(source: str) -> Tokens:
     scanner = Scanner(source)
     return scanner.scan_tokens()
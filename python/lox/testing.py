@@ -0,0 +1,219 @@
+"""
+Helpers for checking Lox programs against the expectations in their comments.
+"""
+
+import os
+import re
+from collections import deque
+from contextlib import redirect_stdout
+from functools import cache
+from io import TextIOBase
+from pathlib import Path
+from textwrap import indent as ident
+
+from lox.__main__ import Lox
+
+TEST_BASE = Path(__file__).parent.parent.parent / "test"
+
+# Print the report for passing programs too, not only for failures.
+VERBOSE = bool(os.environ.get("LOX_TEST_VERBOSE"))
+
+LINE_PATTERN = re.compile(r"^\[line (\d+)\] ")
+
+# Matches the first "//" comment of a line that starts with one of the
+# prefixes understood by parse_expects. The rest of the line is captured.
+EXPECT_PATTERN = re.compile(
+    r"^(?:[^/\n]|/(?!/))*//[ \t]*(expect:|expect |Error at|\[java|\[c|\[)(.*)$",
+    re.MULTILINE,
+)
+EXPECT_HANDLERS = {
+    "expect:": str.strip,
+    "expect ": str.strip,
+    "Error at": lambda rest: "Error at" + rest.rstrip(),
+    "[java": lambda rest: "[" + rest.strip(),
+    "[c": lambda rest: None,
+    "[": lambda rest: "[" + rest.rstrip(),
+}
+
+
+def check_program(section: str, name: str, /):
+    """
+    Check if a program produces the expected output.
+
+    Usually used in this pattern:
+
+        @pytest.mark.parametrize("name", ["prog1", "prog2", ...])
+        def test_some_feature(check, name: str):
+            check("some_section", name)
+    """
+    path, source, expected = load_program(section, name)
+    output, err = run_program(source)
+
+    # The report is only needed when pytest is going to show it.
+    try:
+        if err is not None:
+            raise err
+        compare_output(output, expected)
+    except Exception:
+        print_report(path, source, expected, output)
+        raise
+    if VERBOSE:
+        print_report(path, source, expected, output)
+
+
+def print_report(path: Path, source: str, expected: str, output: list[str]):
+    """
+    Print a program along with its expected and actual output.
+    """
+    print(f"Testing program: {path}\n")
+    print(ident(source, "  "))
+    print()
+
+    print("Expected output:\n")
+    print(ident(expected, "  "))
+    print()
+
+    print("Actual output:\n")
+    print(ident("\n".join(output), "  "))
+    print()
+
+
+@cache
+def load_program(section: str, name: str) -> tuple[Path, str, str]:
+    """
+    Return the path of a test program relative to the test directory, along
+    with its source and expected output.
+
+    Several test modules check the same programs, so each file is only read
+    and parsed once per session.
+    """
+    path = Path(section, f"{name}.lox")
+    source = (TEST_BASE / path).read_text()
+    return path, source, parse_expects(source)
+
+
+def run_program(source: str) -> tuple[list[str], Exception | None]:
+    """
+    Run a program source and return its output lines.
+    """
+    lox = Lox(interactive=True)
+    err = None
+    with redirect_stdout(LineSink()) as f:
+        try:
+            lox.run(source)
+        except Exception as e:
+            err = e
+            print(f"Runtime error: {err}")
+            err.with_traceback(err.__traceback__)
+    return f.getlines(), err
+
+
+class LineSink(TextIOBase):
+    """
+    Text stream that splits everything written to it into lines as it goes.
+
+    Lines break wherever str.splitlines() would break them, so "\r\n", "\r",
+    "\u2028" and the other Unicode line boundaries all end a line.
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.partial = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        *lines, last = (self.partial + text).splitlines(keepends=True) or [""]
+        # The last line is pending until it has a line break. A trailing "\r"
+        # also waits, since the next write may complete it as "\r\n".
+        if not last or last.endswith("\r") or last.splitlines() == [last]:
+            self.partial = last
+        else:
+            lines.append(last)
+            self.partial = ""
+        self.lines.extend(line.splitlines()[0] for line in lines)
+        return len(text)
+
+    def getlines(self) -> list[str]:
+        """
+        Return the lines written so far, without trailing whitespace.
+        """
+        lines = [*self.lines, *self.partial.splitlines()]
+        while lines and not lines[-1].strip():
+            lines.pop()
+        if lines:
+            lines[-1] = lines[-1].rstrip()
+        return lines
+
+
+def parse_expects(src: str) -> str:
+    """
+    Return the expected output lines from a source string.
+    """
+    lines = []
+    for m in EXPECT_PATTERN.finditer(src):
+        message = EXPECT_HANDLERS[m.group(1)](m.group(2))
+        if message is not None:
+            lines.append(message)
+    return "\n".join(lines)
+
+
+def compare_output(output: list[str], expected_stdout: str):
+    """
+    Compare the output lines to the expected output.
+    """
+    expected = expected_stdout.rstrip().splitlines()
+    if output == expected:
+        return
+
+    # Lines are consumed from both ends, so deques keep each step O(1).
+    output = deque(output)
+    expected = deque(expected)
+    while output and expected:
+        if is_compatible_line(output[0], expected[0]):
+            output.popleft()
+            expected.popleft()
+            continue
+        elif is_compatible_line(output[-1], expected[-1]):
+            output.pop()
+            expected.pop()
+            continue
+        raise AssertionError(
+            f"expected output line: {expected[0]!r}, got: {output[0]!r}"
+        )
+
+
+def is_compatible_line(actual: str, expected: str) -> bool:
+    """
+    Check if two output lines are compatible.
+    """
+    while actual != expected:
+        if expected.startswith("runtime error:"):
+            prefix, sep, rest = actual.partition(":")
+            if sep and "Runtime error" in prefix:
+                return rest == expected.removeprefix("runtime error:")
+        elif actual.startswith("[line "):
+            if not expected.startswith("[line "):
+                return actual.partition("] ")[2] == expected
+            m = LINE_PATTERN.match(actual)
+            if m and expected.startswith(tag := m.group()):
+                actual = actual[len(tag) :]
+                expected = expected[len(tag) :]
+                continue
+        elif actual.startswith("Error at '") and expected.startswith("Error:"):
+            return "Error:" + actual.partition("':")[2] == expected
+        return False
+    return True
+
+
+def is_error_line(text: str) -> bool:
+    """
+    Check if a line is an error line.
+    """
+    text = text.lstrip().casefold()
+    return (
+        text.startswith("[line ")
+        or text.startswith("error")
+        or text.startswith("runtime error")
+    )
@@ -1,62 +1,71 @@
-from dataclasses import dataclass
-from typing import Literal
+from __future__ import annotations
+from dataclasses import dataclass, field
+from enum import IntEnum, auto
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from lox.errors import LoxSyntaxError
 
 
 type LiteralValue = str | float | bool | None
-type TokenType = Literal[
+
+
+class TokenType(IntEnum):
     # Single-character tokens.
-    "LEFT_PAREN", 
-    "RIGHT_PAREN", 
-    "LEFT_BRACE", 
-    "RIGHT_BRACE", 
-    "COMMA", 
-    "DOT", 
-    "SEMICOLON", 
-    "MINUS", 
-    "PLUS", 
-    "SLASH", 
-    "STAR", 
+    LEFT_PAREN = auto()
+    RIGHT_PAREN = auto()
+    LEFT_BRACE = auto()
+    RIGHT_BRACE = auto()
+    COMMA = auto()
+    DOT = auto()
+    SEMICOLON = auto()
+    MINUS = auto()
+    PLUS = auto()
+    SLASH = auto()
+    STAR = auto()
 
     # One or two character tokens.
-    "BANG", 
-    "BANG_EQUAL", 
-    "EQUAL", 
-    "EQUAL_EQUAL", 
-    "GREATER", 
-    "GREATER_EQUAL", 
-    "LESS", 
-    "LESS_EQUAL", 
+    BANG = auto()
+    BANG_EQUAL = auto()
+    EQUAL = auto()
+    EQUAL_EQUAL = auto()
+    GREATER = auto()
+    GREATER_EQUAL = auto()
+    LESS = auto()
+    LESS_EQUAL = auto()
 
     # Literals.
-    "IDENTIFIER", 
-    "STRING", 
-    "NUMBER", 
+    IDENTIFIER = auto()
+    STRING = auto()
+    NUMBER = auto()
 
     # Keywords.
-    "AND", 
-    "CLASS", 
-    "ELSE", 
-    "FALSE", 
-    "FUN", 
-    "FOR", 
-    "IF", 
-    "NIL", 
-    "OR", 
-    "PRINT", 
-    "RETURN", 
-    "SUPER", 
-    "THIS", 
-    "TRUE", 
-    "VAR", 
-    "WHILE", 
+    AND = auto()
+    CLASS = auto()
+    ELSE = auto()
+    FALSE = auto()
+    FUN = auto()
+    FOR = auto()
+    IF = auto()
+    NIL = auto()
+    OR = auto()
+    PRINT = auto()
+    RETURN = auto()
+    SUPER = auto()
+    THIS = auto()
+    TRUE = auto()
+    VAR = auto()
+    WHILE = auto()
 
     # Special tokens.
-    "EOF", 
-    "INVALID", 
-    "UNTERMINATED_STRING", 
-]
+    EOF = auto()
+
 
-@dataclass
+# Enum.name is a descriptor lookup, so token listings read names from here.
+TOKEN_NAMES = {type: type.name for type in TokenType}
+
+
+@dataclass(slots=True)
 class Token:
     type: TokenType
     lexeme: str
@@ -64,6 +73,46 @@ class Token:
     literal: LiteralValue = None
 
     def __str__(self):
-        return f"{self.type} {self.lexeme!r} {self.literal}"
+        return f"{TOKEN_NAMES[self.type]} {self.lexeme!r} {self.literal}"
+
+
+@dataclass(slots=True)
+class Tokens:
+    """
+    Sequence of tokens stored column-wise, as parallel lists of types,
+    lexemes, lines and literals.
+
+    The parser mostly looks at token types, so it reads that list directly.
+    Token objects are only created when indexing or iterating, and str()
+    formats the whole listing straight from the columns.
+
+    Characters the scanner could not recognize are not stored as tokens, but
+    reported in the errors list.
+    """
+
+    types: list[TokenType] = field(default_factory=list)
+    lexemes: list[str] = field(default_factory=list)
+    lines: list[int] = field(default_factory=list)
+    literals: list[LiteralValue] = field(default_factory=list)
+    errors: list[LoxSyntaxError] = field(default_factory=list)
+
+    def append(self, type: TokenType, lexeme: str, line: int, literal: LiteralValue = None):
+        self.types.append(type)
+        self.lexemes.append(lexeme)
+        self.lines.append(line)
+        self.literals.append(literal)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(self.types[index], self.lexemes[index], self.lines[index], self.literals[index])
 
+    def __iter__(self) -> Iterator[Token]:
+        return map(Token, self.types, self.lexemes, self.lines, self.literals)
 
+    def __str__(self) -> str:
+        return "\n".join(
+            f"{TOKEN_NAMES[type]} {lexeme!r} {literal}"
+            for type, lexeme, literal in zip(self.types, self.lexemes, self.literals)
+        )
@@ -0,0 +1,252 @@
+"""
+Programs under test/ checked by each chapter's test module, grouped by the
+directory they live in.
+"""
+
+STATEMENTS_AND_STATE = {
+    "assignment": (
+        "syntax",
+        "global",
+        "local",
+        "undefined",
+        "grouping",
+        "associativity",
+        "infix_operator",
+        "prefix_operator",
+    ),
+    "block": ("scope",),
+    "bool": ("equality", "not"),
+    "nil": ("literal",),
+    "operator": (
+        "add",
+        "add_bool_nil",
+        "add_bool_num",
+        "add_bool_string",
+        "add_nil_nil",
+        "add_num_nil",
+        "add_string_nil",
+        "comparison",
+        "divide",
+        "divide_nonnum_num",
+        "divide_num_nonnum",
+        "equals",
+        "equals_class",
+        "equals_method",
+        "greater_nonnum_num",
+        "greater_num_nonnum",
+        "greater_or_equal_nonnum_num",
+        "greater_or_equal_num_nonnum",
+        "less_nonnum_num",
+        "less_num_nonnum",
+        "less_or_equal_nonnum_num",
+        "less_or_equal_num_nonnum",
+        "multiply",
+        "multiply_nonnum_num",
+        "multiply_num_nonnum",
+        "negate",
+        "negate_nonnum",
+        "not",
+        "not_class",
+        "not_equals",
+        "subtract",
+        "subtract_nonnum_num",
+        "subtract_num_nonnum",
+    ),
+    "print": ("hello", "missing_argument"),
+    "string": ("error_after_multiline", "literals", "multiline", "unterminated"),
+    "variable": (
+        "duplicate_local",
+        "duplicate_parameter",
+        "in_middle_of_block",
+        "in_nested_block",
+        "redeclare_global",
+        "redefine_global",
+        "scope_reuse_in_different_blocks",
+        "shadow_and_local",
+        "shadow_global",
+        "shadow_local",
+        "undefined_global",
+        "undefined_local",
+        "uninitialized",
+        "unreached_undefined",
+        "use_global_in_initializer",
+        "use_false_as_var",
+        "use_nil_as_var",
+        "use_this_as_var",
+    ),
+}
+
+
+CONTROL_FLOW = {
+    "block": ("empty",),
+    "for": (
+        "scope",
+        "var_in_body",
+        "statement_condition",
+        "statement_increment",
+        "statement_initializer",
+    ),
+    "if": ("if", "else", "truth", "dangling_else", "var_in_else", "var_in_then"),
+    "logical_operator": ("and", "and_truth", "or", "or_truth"),
+    "while": ("syntax", "var_in_body"),
+}
+
+
+FUNCTIONS = {
+    "call": ("bool", "nil", "string", "num"),
+    "for": ("syntax",),
+    "function": (
+        "body_must_be_block",
+        "empty_body",
+        "extra_arguments",
+        "mutual_recursion",
+        "local_recursion",
+        "missing_arguments",
+        "missing_comma_in_parameters",
+        "nested_call_with_arguments",
+        "parameters",
+        "print",
+        "recursion",
+        "too_many_arguments",
+        "too_many_parameters",
+    ),
+    "if": ("fun_in_else", "fun_in_then"),
+    "return": (
+        "after_else",
+        "after_if",
+        "after_while",
+        "at_top_level",
+        "in_function",
+        "return_nil_if_no_value",
+    ),
+    "while": ("fun_in_body", "closure_in_body", "return_closure", "return_inside"),
+}
+
+
+RESOLVING_AND_BINDING = {
+    "function": ("local_mutual_recursion",),
+    "closure": (
+        "assign_to_closure",
+        "assign_to_shadowed_later",
+        "close_over_function_parameter",
+        "close_over_later_variable",
+        "close_over_method_parameter",
+        "closed_closure_in_function",
+        "nested_closure",
+        "open_closure_in_function",
+        "reference_closure_multiple_times",
+        "reuse_closure_slot",
+        "shadow_closure_with_local",
+        "unused_closure",
+        "unused_later_closure",
+    ),
+    "variable": ("early_bound", "use_local_in_initializer", "collide_with_parameter"),
+}
+
+
+CLASSES = {
+    "assignment": ("to_this",),
+    "call": ("object",),
+    "class": ("empty", "local_reference_self", "reference_self"),
+    "constructor": (
+        "arguments",
+        "call_init_early_return",
+        "call_init_explicitly",
+        "default",
+        "default_arguments",
+        "early_return",
+        "extra_arguments",
+        "init_not_method",
+        "missing_arguments",
+        "return_in_nested_function",
+        "return_value",
+    ),
+    "if": ("class_in_else", "class_in_then"),
+    "field": (
+        "call_function_field",
+        "call_nonfunction_field",
+        "get_and_set_method",
+        "get_on_bool",
+        "get_on_class",
+        "get_on_function",
+        "get_on_nil",
+        "get_on_num",
+        "get_on_string",
+        "many",
+        "method",
+        "method_binds_this",
+        "on_instance",
+        "set_evaluation_order",
+        "set_on_bool",
+        "set_on_class",
+        "set_on_function",
+        "set_on_nil",
+        "set_on_num",
+        "set_on_string",
+        "undefined",
+    ),
+    "for": ("class_in_body",),
+    "method": (
+        "arity",
+        "empty_block",
+        "extra_arguments",
+        "missing_arguments",
+        "not_found",
+        "print_bound_method",
+        "refer_to_name",
+        "too_many_arguments",
+        "too_many_parameters",
+    ),
+    "return": ("in_method",),
+    "this": (
+        "closure",
+        "nested_class",
+        "nested_closure",
+        "this_at_top_level",
+        "this_in_method",
+        "this_in_top_level_function",
+    ),
+    "while": ("class_in_body",),
+    "variable": ("local_from_method",),
+}
+
+
+INHERITANCE = {
+    "class": (
+        "inherited_method",
+        "local_inherit_other",
+        "local_inherit_self",
+        "inherit_self",
+    ),
+    "inheritance": (
+        "constructor",
+        "inherit_from_function",
+        "inherit_from_nil",
+        "inherit_from_number",
+        "inherit_methods",
+        "parenthesized_superclass",
+        "set_fields_from_base_class",
+    ),
+    "super": (
+        "bound_method",
+        "call_other_method",
+        "call_same_method",
+        "closure",
+        "constructor",
+        "extra_arguments",
+        "indirectly_inherited",
+        "missing_arguments",
+        "no_superclass_bind",
+        "no_superclass_call",
+        "no_superclass_method",
+        "parenthesized",
+        "reassign_superclass",
+        "super_at_top_level",
+        "super_in_closure_in_inherited_method",
+        "super_in_inherited_method",
+        "super_in_top_level_function",
+        "super_without_dot",
+        "super_without_name",
+        "this_in_superclass_method",
+    ),
+}
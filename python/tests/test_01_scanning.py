@@ -9,11 +9,12 @@ The tokens should have a __str__ method that produces a representation like:
 It may contain additional information, but that will be ignored by the tests.
 """
 
+import re
 from dataclasses import dataclass
-from functools import cached_property
+from functools import cache, cached_property
 from itertools import count
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, NamedTuple
 
 TEST_BASE = Path(__file__).parent.parent / "examples" / "scanning"
 
@@ -24,56 +25,80 @@ TEST_BASE = Path(__file__).parent.parent / "examples" / "scanning"
 
 
 class Result:
+    __slots__ = ()
     line: int
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Example:
     source: str
-    expect: list[Result]
+    expect: list["Result | Expect | ExpectRuntimeError"]
 
     def had_errors(self) -> bool:
-        return not all(isinstance(r, Expect) for r in self.expect)
+        return not all(type(r) is Expect for r in self.expect)
 
     def had_syntax_errors(self) -> bool:
         return any(isinstance(r, (Error, ErrorAt, ErrorAtEnd)) for r in self.expect)
 
     def output_lines(self) -> list[str]:
-        return [r.message for r in self.expect if isinstance(r, Expect)]
+        return [r.message for r in self.expect if type(r) is Expect]
 
     def stdout(self) -> str:
         return "\n".join(self.output_lines())
 
 
-@dataclass
-class Expect(Result):
+# Expected outputs are by far the most common results, so they are plain
+# named tuples, which are cheaper to build than dataclasses.
+class Expect(NamedTuple):
     line: int
     message: str
 
 
-@dataclass
-class ExpectRuntimeError(Result):
+class ExpectRuntimeError(NamedTuple):
     line: int
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Error(Result):
     line: int
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorAt(Error):
     token: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorAtEnd(Error):
     pass
 
 
+def parse_error_at(line: int, rest: str) -> "ErrorAt":
+    token, sep, message = rest.partition("':")
+    if not sep:
+        comment = "Error at '" + rest
+        raise ValueError(f"malformed error at: {comment!r}")
+    return ErrorAt(line=line, message=message.strip(), token=token)
+
+
+# Matches the first "//" comment of a line when it starts with one of the
+# prefixes in EXAMPLE_HANDLERS. The rest of the comment is captured.
+EXAMPLE_PATTERN = re.compile(
+    r"(?:[^/]|/(?!/))*//\s*"
+    r"(expect:|Error at end:|Error at '|Error:|expect runtime error:)(.*)"
+)
+EXAMPLE_HANDLERS = {
+    "expect:": lambda line, rest: Expect(line, rest.strip()),
+    "Error at end:": lambda line, rest: ErrorAtEnd(line=line, message=rest.strip()),
+    "Error at '": parse_error_at,
+    "Error:": lambda line, rest: Error(line=line, message=rest.strip()),
+    "expect runtime error:": lambda line, rest: ExpectRuntimeError(line, rest.strip()),
+}
+
+
 def example(soure_or_path: str | Path) -> "Example":
     """
     Return an example from a file or source string.
@@ -91,37 +116,16 @@ def parse_example(source: str) -> "Example":
     """
     Parse a source string into an Example object.
     """
-    expect: list[Result] = []
+    expect: list[Result | Expect | ExpectRuntimeError] = []
     for line_no, line in enumerate(source.splitlines(), start=1):
-        line = line.strip()
-        _, sep, comment = line.partition("//")
-        if not sep:
-            continue
-        comment = comment.strip()
-
-        if comment.startswith(prefix := "expect:"):
-            message = comment.removeprefix(prefix).strip()
-            expect.append(Expect(line=line_no, message=message))
-        elif comment.startswith(prefix := "Error at end:"):
-            message = comment.removeprefix(prefix).strip()
-            expect.append(ErrorAtEnd(line=line_no, message=message))
-        elif comment.startswith(prefix := "Error at '"):
-            rest = comment.removeprefix(prefix)
-            token, sep, message = rest.partition("':")
-            if not sep:
-                raise ValueError(f"malformed error at: {comment!r}")
-            message = message.strip()
-            expect.append(ErrorAt(line=line_no, message=message, token=token))
-        elif comment.startswith(prefix := "Error:"):
-            message = comment.removeprefix(prefix).strip()
-            expect.append(Error(line=line_no, message=message))
-        elif comment.startswith(prefix := "expect runtime error:"):
-            message = comment.removeprefix(prefix).strip()
-            expect.append(ExpectRuntimeError(line=line_no, message=message))
+        if m := EXAMPLE_PATTERN.match(line):
+            prefix, rest = m.groups()
+            expect.append(EXAMPLE_HANDLERS[prefix](line_no, rest.rstrip()))
 
     return Example(source, expect=expect)
 
 
+@cache
 def mod(name: str):
     if ":" in name:
         module_name, _, attr = name.partition(":")
@@ -135,6 +139,7 @@ def mod(name: str):
         return _mod(name)
 
 
+@cache
 def _mod(name: str):
     import importlib
 
@@ -197,8 +202,11 @@ class TestWhitesoace(ScannerBase):
     file = "whitespace"
 
 
+# Deletes the quotes around lexemes in token representations.
+DROP_QUOTES = str.maketrans("", "", "'")
+
+
 def normalize_token_representation(line: str) -> str:
     if line.endswith("null"):
         line = line[:-4] + "None"
-    line = line.replace("'", "").rstrip()
-    return line
+    return line.translate(DROP_QUOTES).rstrip()
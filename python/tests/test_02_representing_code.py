@@ -3,34 +3,37 @@ This test module assumes the AST types Binary, Grouping, Literal and Unary with
 thoses exact names and with behaviour and signatures as defined in the book.
 """
 
+from functools import cache
 from pathlib import Path
 
 from lox import ast
 from lox.printer import pretty
-from lox.tokens import Token
+from lox.tokens import Token, TokenType
 
 TEST_BASE = Path(__file__).parent.parent / "examples" / "scanning"
 
 
 class TestRepresentation:
     OPERATORS = {
-        "!": "BANG",
-        "!=": "BANG_EQUAL",
-        "==": "EQUAL_EQUAL",
-        ">": "GREATER",
-        ">=": "GREATER_EQUAL",
-        "<": "LESS",
-        "<=": "LESS_EQUAL",
-        "+": "PLUS",
-        "-": "MINUS",
-        "*": "STAR",
-        "/": "SLASH",
-        "and": "AND",
-        "or": "OR",
+        "!": TokenType.BANG,
+        "!=": TokenType.BANG_EQUAL,
+        "==": TokenType.EQUAL_EQUAL,
+        ">": TokenType.GREATER,
+        ">=": TokenType.GREATER_EQUAL,
+        "<": TokenType.LESS,
+        "<=": TokenType.LESS_EQUAL,
+        "+": TokenType.PLUS,
+        "-": TokenType.MINUS,
+        "*": TokenType.STAR,
+        "/": TokenType.SLASH,
+        "and": TokenType.AND,
+        "or": TokenType.OR,
     }
 
-    def op(self, symbol: str, lineno: int = 1):
-        type = self.OPERATORS[symbol]
+    @staticmethod
+    @cache
+    def op(symbol: str, lineno: int = 1):
+        type = TestRepresentation.OPERATORS[symbol]
         return Token(type, symbol, lineno)
 
     def expr(self, value):
@@ -7,26 +7,26 @@ from pathlib import Path
 
 from lox import ast
 from lox.printer import pretty
-from lox.tokens import Token
+from lox.tokens import Token, TokenType
 
 TEST_BASE = Path(__file__).parent.parent / "examples" / "scanning"
 
 
 class TestRepresentation:
     OPERATORS = {
-        "!": "BANG",
-        "!=": "BANG_EQUAL",
-        "==": "EQUAL_EQUAL",
-        ">": "GREATER",
-        ">=": "GREATER_EQUAL",
-        "<": "LESS",
-        "<=": "LESS_EQUAL",
-        "+": "PLUS",
-        "-": "MINUS",
-        "*": "STAR",
-        "/": "SLASH",
-        "and": "AND",
-        "or": "OR",
+        "!": TokenType.BANG,
+        "!=": TokenType.BANG_EQUAL,
+        "==": TokenType.EQUAL_EQUAL,
+        ">": TokenType.GREATER,
+        ">=": TokenType.GREATER_EQUAL,
+        "<": TokenType.LESS,
+        "<=": TokenType.LESS_EQUAL,
+        "+": TokenType.PLUS,
+        "-": TokenType.MINUS,
+        "*": TokenType.STAR,
+        "/": TokenType.SLASH,
+        "and": TokenType.AND,
+        "or": TokenType.OR,
     }
 
     def op(self, symbol: str, lineno: int = 1):
@@ -1,40 +1,42 @@
-import io
+import os
 import pathlib
-from contextlib import redirect_stdout
 
 import pytest
 
-EXAMPLES = {"root": ["empty_file", "precedence", "unexpected_character"]}
+ROOT_EXAMPLES = ["empty_file", "precedence", "unexpected_character"]
 BASE = pathlib.Path(__file__).parent.parent.parent / "test"
 SKIP_MODULES = ["scanning", "benchmark", "expressions"]
 SKIP_EXAMPLES = {}
 
-for mod_path in BASE.iterdir():
-    if mod_path.is_dir() and mod_path.name not in SKIP_MODULES:
-        mod = mod_path.name
-        for file_path in mod_path.iterdir():
-            if file_path.suffix == ".lox" and file_path.stem not in SKIP_EXAMPLES.get(
-                mod, []
-            ):
-                name = file_path.stem
-                EXAMPLES.setdefault(mod, []).append(name)
-
-
-@pytest.mark.parametrize("mod, examples", EXAMPLES.items(), ids=EXAMPLES.keys())
-def test_example(check, mod: str, examples: list[str]):
-    print(f"Testing module: {mod}")
-    if mod == "root":
-        mod = ""
-    for name in examples:
-        error = None
-        with redirect_stdout(io.StringIO()) as f:
-            try:
-                check(mod, name)
-                print(f"Test {name} passed.")
-                continue
-            except Exception as e:
-                error = e.with_traceback(e.__traceback__)
-
-        print(f"Error occurred while testing {name}: {error}")
-        print(f.getvalue())
-        raise error
+
+def find_examples() -> dict[str, list[str]]:
+    """
+    Map each test directory to the names of the programs it contains.
+    """
+    examples = {"root": ROOT_EXAMPLES}
+
+    # DirEntry caches the file type from the directory listing, so the walk
+    # does not need a stat call per file.
+    for mod_entry in os.scandir(BASE):
+        if mod_entry.is_dir() and mod_entry.name not in SKIP_MODULES:
+            mod = mod_entry.name
+            skip = SKIP_EXAMPLES.get(mod, [])
+            for file_entry in os.scandir(mod_entry.path):
+                name, ext = os.path.splitext(file_entry.name)
+                if ext == ".lox" and name not in skip:
+                    examples.setdefault(mod, []).append(name)
+    return examples
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc):
+    # The directories are only walked when test_example is being collected,
+    # not whenever this module is imported.
+    if metafunc.function is test_example:
+        examples = find_examples()
+        cases = [(mod, name) for mod, names in examples.items() for name in names]
+        metafunc.parametrize("mod, name", cases, ids=[f"{m}/{n}" for m, n in cases])
+
+
+@pytest.mark.aggregate
+def test_example(check, mod: str, name: str):
+    check("" if mod == "root" else mod, name)